@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Decode Benchmark - Rollout lines/sec per JSON backend and extraction mode
+Each backend runs in a fresh interpreter since it is picked at import time;
+besides the raw reader, every mode's extract and render path is timed cold
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bench_memory import VIEWS
+from synthetic import MB, write_rollout
+
+# Record types each mode asks the reader for; None decodes everything
+MODES = {
+    'all': None,
+    'full': {'message', 'function_call', 'function_call_output', 'reasoning'},
+    'lightweight': {'message'},
+}
+
+def run(path):
+    from codex_resume import decode
+    from codex_resume.records import iter_records
+    
+    with open(path, 'rb') as f:
+        lines = sum(1 for _ in f)
+    
+    results = {}
+    for mode, types in MODES.items():
+        start = time.perf_counter()
+        kept = sum(1 for _ in iter_records(path, types))
+        elapsed = time.perf_counter() - start
+        results[mode] = {'kept': kept, 'seconds': round(elapsed, 3), 'lines_per_sec': int(lines / elapsed)}
+    for view, func in VIEWS.items():
+        start = time.perf_counter()
+        kept = func(path)
+        elapsed = time.perf_counter() - start
+        results[f"{view} mode"] = {'kept': kept, 'seconds': round(elapsed, 3), 'lines_per_sec': int(lines / elapsed)}
+    print(json.dumps({'backend': decode.BACKEND, 'lines': lines, 'modes': results}))
+
+def main():
+    if len(sys.argv) == 3 and sys.argv[1] == '--run':
+        run(sys.argv[2])
+        return
+    
+    size_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "rollout-bench.jsonl")
+        print(f"Writing {size_mb} MB synthetic rollout...")
+        write_rollout(path, size_mb * MB)
+        seen = set()
+        for backend in ('json', 'orjson', 'msgspec'):
+            # A fresh HOME per backend, so every mode starts with an empty cache
+            home = os.path.join(tmp, f"home-{backend}")
+            os.mkdir(home)
+            env = dict(os.environ, CODEX_RESUME_JSON=backend, HOME=home, CODEX_RESUME_DAEMON='0')
+            result = subprocess.run([sys.executable, __file__, '--run', path],
+                                    stdout=subprocess.PIPE, env=env, check=True)
+            stats = json.loads(result.stdout)
+            # Missing optional backends fall back to json; report each once
+            if stats['backend'] in seen:
+                continue
+            seen.add(stats['backend'])
+            print(f"\n{stats['backend']} ({stats['lines']:,} lines)")
+            for mode, numbers in stats['modes'].items():
+                print(f"  {mode:<16} {numbers['lines_per_sec']:>10,} lines/sec  ({numbers['kept']:,} kept)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Filter Benchmark - Meta-message checks on pathological long messages
+Compares the old chain of startswith/in checks with the compiled filter
+"""
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from codex_resume.filters import DEFAULT_RULES, MessageFilter
+
+def legacy_is_meta(text):
+    """The per-rule checks extract_real_conversation used to run"""
+    if text.startswith('<environment_context'):
+        return True
+    if text.startswith('<user_instructions>'):
+        return True
+    for marker in DEFAULT_RULES['user']['contains']:
+        if marker in text:
+            return True
+    for exact in DEFAULT_RULES['user']['exact']:
+        if text.strip() == exact:
+            return True
+    return False
+
+def combined_regex():
+    rules = DEFAULT_RULES['user']
+    parts = [r'\A' + re.escape(prefix) for prefix in rules['prefix']]
+    parts += [re.escape(marker) for marker in rules['contains']]
+    parts += [r'\A\s*' + re.escape(exact) + r'\s*\Z' for exact in rules['exact']]
+    pattern = re.compile('|'.join(parts))
+    return lambda text: pattern.search(text) is not None
+
+def timed(check, text, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        check(text)
+    return (time.perf_counter() - start) / repeat * 1000
+
+def main():
+    size_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    log_line = "2025-01-01 12:00:00 INFO worker=3 step=== done ok\n"
+    body = log_line * (size_mb * 1024 * 1024 // len(log_line))
+    cases = {
+        'long, no match': body,
+        'long, match at end': body + "Recent conversation:",
+        'long, whitespace padded': " " * (size_mb * 1024 * 1024) + "hi",
+        'short message': "please run the tests again",
+    }
+    engine = MessageFilter(**DEFAULT_RULES['user'])
+    checks = {
+        'legacy chain': legacy_is_meta,
+        'combined regex': combined_regex(),
+        'MessageFilter': engine.matches,
+    }
+    backend = 'aho-corasick' if engine.automaton is not None else 'substring scans'
+    print(f"MessageFilter backend: {backend}")
+    for case, text in cases.items():
+        repeat = 10000 if len(text) < 1000 else 5
+        print(f"\n{case} ({len(text):,} chars)")
+        for name, check in checks.items():
+            print(f"  {name:<15} {timed(check, text, repeat):10.4f} ms")
+
+if __name__ == "__main__":
+    main()
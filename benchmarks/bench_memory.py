@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Memory Benchmark - Peak RSS of readlines() vs the streamed reader and each mode
+Builds a synthetic rollout and reads it every way in fresh interpreters; the
+modes run their real extract and render path with the cache on, cold
+"""
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from synthetic import MB, write_rollout
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS reports bytes
+    return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024
+
+def run_readlines(path):
+    """The pre-streaming extractor loop: whole file in memory, then parse"""
+    count = 0
+    with open(path, 'r') as f:
+        lines = f.readlines()
+    for line in lines:
+        if line.strip():
+            try:
+                json.loads(line)
+                count += 1
+            except json.JSONDecodeError:
+                continue
+    return count
+
+def run_stream(path):
+    from codex_resume.records import iter_records
+    count = 0
+    for _ in iter_records(path):
+        count += 1
+    return count
+
+def run_lightweight(path):
+    from codex_resume.views import extract_real_conversation, render_conversation
+    messages = extract_real_conversation(path)
+    render_conversation(messages)
+    return len(messages)
+
+def run_full(path):
+    from codex_resume.artifact import ContextWriter
+    from codex_resume.dedup import DEDUP, OutputDeduper
+    from codex_resume.views import extract_full_session, iter_context_parts
+    writer = ContextWriter()
+    for kind, part in iter_context_parts(extract_full_session(path), OutputDeduper() if DEDUP else None):
+        writer.write(part, kind)
+    return writer.close(session=str(path))['lines']
+
+def run_direct(path):
+    from codex_resume.views import extract_important_content
+    return extract_important_content(path).count("\n") + 1
+
+def run_chunked(path):
+    from codex_resume.modes import TOKEN_LIMIT
+    from codex_resume.views import extract_key_messages, pack_key_messages, render_key_messages
+    messages = extract_key_messages(path)
+    render_key_messages(messages)
+    pack_key_messages(messages, TOKEN_LIMIT)
+    return len(messages)
+
+MODES = {'readlines': run_readlines, 'stream': run_stream}
+# What each resume mode does before handing codex the context
+VIEWS = {'lightweight': run_lightweight, 'full': run_full, 'direct': run_direct, 'chunked': run_chunked}
+
+def main():
+    if len(sys.argv) == 4 and sys.argv[1] == '--run':
+        count = dict(MODES, **VIEWS)[sys.argv[2]](sys.argv[3])
+        print(json.dumps({'mode': sys.argv[2], 'records': count, 'peak_rss_mb': round(peak_rss_mb(), 1)}))
+        return
+    
+    size_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "rollout-bench.jsonl")
+        print(f"Writing {size_mb} MB synthetic rollout...")
+        write_rollout(path, size_mb * MB)
+        for mode in [*MODES, *VIEWS]:
+            # A fresh HOME per run: an empty cache, and no writes to the real ~/.codex
+            home = os.path.join(tmp, f"home-{mode}")
+            os.mkdir(home)
+            env = dict(os.environ, HOME=home, CODEX_RESUME_DAEMON='0')
+            result = subprocess.run([sys.executable, __file__, '--run', mode, path],
+                                    stdout=subprocess.PIPE, env=env, check=True)
+            stats = json.loads(result.stdout)
+            print(f"  {mode:<12} {stats['records']:>9,} items  peak RSS {stats['peak_rss_mb']:>8.1f} MB")
+
+if __name__ == "__main__":
+    main()
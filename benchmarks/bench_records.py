@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Record Benchmark - Bytes per entry of entry dicts vs the compact EntryStore
+Parses a synthetic rollout both ways and measures the live heap with tracemalloc
+"""
+import gc
+import json
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from synthetic import MB, write_rollout
+from codex_resume.pipeline import ENTRY_TYPES, initial_state, iter_entries
+from codex_resume.records import RecordStream
+from codex_resume.store import EntryStore
+
+def as_dicts(session_file):
+    """The list of entry dicts the pipeline used to cache"""
+    entries = []
+    for kind, text, message in iter_entries(RecordStream(session_file, ENTRY_TYPES), initial_state()):
+        entry = {'type': kind, 'text': text}
+        if message >= 0:
+            entry['message'] = message
+        entries.append(entry)
+    return entries
+
+def as_store(session_file):
+    """The EntryStore as load_store hands it to the views, rebuilt from its dump"""
+    entries = EntryStore()
+    for kind, text, message in iter_entries(RecordStream(session_file, ENTRY_TYPES), initial_state()):
+        entries.append(kind, text, message)
+    return EntryStore.load(entries.dump())
+
+def retained_bytes(build, session_file):
+    """Heap bytes still held by build's result once it returns"""
+    gc.collect()
+    tracemalloc.start()
+    result = build(session_file)
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size, result
+
+def main():
+    size_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    with tempfile.TemporaryDirectory() as tmp:
+        session_file = Path(tmp) / "rollout-bench.jsonl"
+        write_rollout(session_file, size_mb * MB)
+
+        # UTF-8 size of the texts themselves, which neither layout can avoid
+        text_bytes = len(as_store(session_file).buffer)
+        results = {'rollout_mb': size_mb, 'text_bytes': text_bytes}
+        for name, build in (('dicts', as_dicts), ('store', as_store)):
+            size, entries = retained_bytes(build, session_file)
+            count = len(entries)
+            results[name] = {
+                'entries': count,
+                'bytes': size,
+                'bytes_per_entry': round(size / count, 1),
+                'overhead_per_entry': round((size - text_bytes) / count, 1),
+            }
+            del entries
+    print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Benchmark Suite - Discovery, extraction and rendering on a synthetic sessions tree
+Every case runs in a fresh interpreter against the same generated HOME and
+reports wall time, records/sec and peak RSS as JSON
+
+Settings are the ones users run with, transcript cache included: each case
+starts from an empty cache, so its first run is cold and the rest are warm.
+Save a run with --output and pass it to --compare on a later run to see
+how each case moved.
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bench_memory import peak_rss_mb
+from synthetic import write_sessions
+
+def case_find_sessions(session_file, cwd):
+    from codex_resume.index import find_sessions_for_directory
+    return None, lambda _: find_sessions_for_directory(Path(cwd))
+
+def case_extract_real_conversation(session_file, cwd):
+    from codex_resume.views import extract_real_conversation
+    return None, lambda _: extract_real_conversation(session_file)
+
+def case_extract_full_session(session_file, cwd):
+    from codex_resume.views import extract_full_session
+    return None, lambda _: list(extract_full_session(session_file))
+
+def case_extract_important_content(session_file, cwd):
+    from codex_resume.views import extract_important_content
+    return None, lambda _: extract_important_content(session_file)
+
+def case_extract_key_messages(session_file, cwd):
+    from codex_resume.views import extract_key_messages
+    return None, lambda _: extract_key_messages(session_file)
+
+def case_render_conversation(session_file, cwd):
+    from codex_resume.views import extract_real_conversation, render_conversation
+    return extract_real_conversation(session_file), render_conversation
+
+def case_render_full(session_file, cwd):
+    from codex_resume.artifact import ContextWriter
+    from codex_resume.dedup import DEDUP, OutputDeduper
+    from codex_resume.views import extract_full_session, iter_context_parts
+
+    def render(entries):
+        writer = ContextWriter()
+        for kind, part in iter_context_parts(entries, OutputDeduper() if DEDUP else None):
+            writer.write(part, kind)
+        return writer.close(session=str(session_file))
+    return list(extract_full_session(session_file)), render
+
+def case_render_key_messages(session_file, cwd):
+    from codex_resume.modes import TOKEN_LIMIT
+    from codex_resume.views import extract_key_messages, pack_key_messages, render_key_messages
+
+    def render(messages):
+        render_key_messages(messages)
+        return pack_key_messages(messages, TOKEN_LIMIT)
+    return extract_key_messages(session_file), render
+
+def resume_case(mode_name):
+    """Setup for a whole mode run, from extraction to handing codex the context
+
+    codex is a stub on PATH, so what is timed is everything up to the exec.
+    """
+    def setup(session_file, cwd):
+        from codex_resume import modes
+        mode = getattr(modes, mode_name)
+        session = Path(session_file)
+
+        def resume(_):
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                mode.resume(session, [session])
+        return None, resume
+    return setup
+
+case_resume_lightweight = resume_case('LIGHTWEIGHT')
+case_resume_full = resume_case('FULL')
+case_resume_direct = resume_case('DIRECT')
+case_resume_chunked = resume_case('CHUNKED')
+
+# Case name -> setup(session_file, cwd) returning (argument, timed function);
+# the setup itself is not timed
+CASES = {name[len('case_'):]: func for name, func in globals().items() if name.startswith('case_')}
+
+def run_case(name, session_file, cwd, repeat):
+    """Time one case in this interpreter and print its numbers as JSON"""
+    argument, func = CASES[name](session_file, cwd)
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(argument)
+        times.append(time.perf_counter() - start)
+    print(json.dumps({'times': times, 'peak_rss_mb': round(peak_rss_mb(), 1)}))
+
+def environment():
+    from codex_resume import decode, tokens
+    return {
+        'python': platform.python_version(),
+        'platform': sys.platform,
+        'json_backend': decode.BACKEND,
+        'tokenizer': tokens.TOKENIZER or 'auto',
+    }
+
+def run_suite(args):
+    cases = args.cases.split(',') if args.cases else list(CASES)
+    unknown = [name for name in cases if name not in CASES]
+    if unknown:
+        sys.exit(f"Unknown cases: {', '.join(unknown)} (choose from {', '.join(CASES)})")
+    cwds = [f"/bench/project{i}" for i in range(args.cwds)]
+    params = {
+        'sessions': args.sessions,
+        'size_kb': args.size_kb,
+        'tool_ratio': args.tool_ratio,
+        'output_bytes': args.output_bytes,
+        'cwds': args.cwds,
+        'seed': args.seed,
+        'repeat': args.repeat,
+        'cache': not args.no_cache,
+    }
+
+    with tempfile.TemporaryDirectory() as home:
+        sessions_dir = Path(home) / ".codex" / "sessions"
+        start = time.perf_counter()
+        written = write_sessions(sessions_dir, args.sessions, args.size_kb * 1024, cwds, args.tool_ratio,
+                                 args.output_bytes, args.seed)
+        print(f"Generated {len(written)} sessions in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+        session_file, cwd, records = written[0]
+        session_bytes = session_file.stat().st_size
+
+        # A codex that exits at once, for the resume_* cases
+        bin_dir = Path(home) / "bin"
+        bin_dir.mkdir()
+        (bin_dir / "codex").write_text("#!/bin/sh\nexit 0\n")
+        (bin_dir / "codex").chmod(0o755)
+        env = dict(os.environ, HOME=home, CODEX_RESUME_DAEMON='0',
+                   PATH=f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}")
+        if args.no_cache:
+            env['CODEX_RESUME_CACHE_BYTES'] = '0'
+        results = {}
+        for name in cases:
+            # Every case starts cold, whatever the cases before it cached
+            shutil.rmtree(sessions_dir.parent / "resume-cache", ignore_errors=True)
+            # Discovery scans every session; the rest read the newest one
+            count = len(written) if name == 'find_sessions' else records
+            output = subprocess.run([sys.executable, __file__, '--run', name, str(session_file), cwd, str(args.repeat)],
+                                    stdout=subprocess.PIPE, env=env, check=True).stdout
+            stats = json.loads(output)
+            best = min(stats['times'])
+            results[name] = {
+                'wall_ms': round(best * 1000, 2),
+                'first_ms': round(stats['times'][0] * 1000, 2),
+                'mean_ms': round(sum(stats['times']) / len(stats['times']) * 1000, 2),
+                'records': count,
+                'records_per_sec': int(count / best) if best > 0 else None,
+                'peak_rss_mb': stats['peak_rss_mb'],
+            }
+            print(f"  {name:<28} {results[name]['wall_ms']:>10.2f} ms", file=sys.stderr)
+
+    return {
+        'params': params,
+        'environment': environment(),
+        'session_bytes': session_bytes,
+        'results': results,
+    }
+
+def compare(report, baseline):
+    """Print each case's wall time against a saved baseline report"""
+    print(f"\n{'case':<28} {'baseline':>12} {'now':>12} {'change':>8}", file=sys.stderr)
+    for name, now in report['results'].items():
+        before = baseline.get('results', {}).get(name)
+        if before is None or not before['wall_ms']:
+            continue
+        change = (now['wall_ms'] - before['wall_ms']) / before['wall_ms'] * 100
+        print(f"{name:<28} {before['wall_ms']:>9.2f} ms {now['wall_ms']:>9.2f} ms {change:>+7.1f}%", file=sys.stderr)
+    if baseline.get('params') != report['params']:
+        print("(parameters differ from the baseline run)", file=sys.stderr)
+
+def main():
+    if len(sys.argv) == 6 and sys.argv[1] == '--run':
+        run_case(sys.argv[2], sys.argv[3], sys.argv[4], int(sys.argv[5]))
+        return
+
+    parser = argparse.ArgumentParser(description="Time codex-resume on a synthetic sessions tree")
+    parser.add_argument('--sessions', type=int, default=200, help="number of rollouts (default 200)")
+    parser.add_argument('--size-kb', type=int, default=512, help="size of each rollout in KB (default 512)")
+    parser.add_argument('--tool-ratio', type=float, default=1.0, help="tool calls per user message (default 1.0)")
+    parser.add_argument('--output-bytes', type=int, default=8000, help="mean tool output size (default 8000)")
+    parser.add_argument('--cwds', type=int, default=4, help="distinct project directories (default 4)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3, help="timed runs per case; the best is reported")
+    parser.add_argument('--no-cache', action='store_true', help="turn the transcript cache off, as CODEX_RESUME_CACHE_BYTES=0 does")
+    parser.add_argument('--cases', help=f"comma-separated subset of: {', '.join(CASES)}")
+    parser.add_argument('--output', help="also write the JSON report to this file")
+    parser.add_argument('--compare', help="JSON report from an earlier run to compare against")
+    args = parser.parse_args()
+
+    report = run_suite(args)
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        Path(args.output).write_text(text + "\n")
+    if args.compare:
+        with open(args.compare) as f:
+            compare(report, json.load(f))
+
+if __name__ == "__main__":
+    main()
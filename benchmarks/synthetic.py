@@ -0,0 +1,116 @@
+"""
+Synthetic Rollouts - Deterministic ~/.codex/sessions trees for the benchmarks
+The same seed and parameters always produce byte-identical files
+"""
+import json
+import os
+import random
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+MB = 1024 * 1024
+
+# Sessions are laid out backwards in time from here, SESSION_GAP apart
+BASE_TIME = datetime(2025, 6, 30, 18, 0, 0)
+SESSION_GAP = timedelta(hours=7)
+
+WORDS = ("the", "test", "fails", "because", "parser", "index", "session", "cache", "returns",
+         "None", "when", "file", "grows", "please", "check", "output", "again", "fixed", "by",
+         "moving", "lookup", "into", "loop", "config", "update", "README", "and", "run", "it")
+COMMANDS = ("pytest -q", "git status", "git diff --stat", "ls -la", "python -m compileall -q .",
+            "grep -rn TODO .", "cat setup.py")
+LOG_LINES = ("collected 214 items", "tests/test_index.py ........ [ 40%]",
+             "M codex_resume/index.py", "drwxr-xr-x  5 user user 4096 Jan  1 10:00 .",
+             "Traceback (most recent call last):", "  File \"index.py\", line 88, in refresh",
+             "ok", "1 passed, 2 warnings in 0.31s")
+
+def sentence(rng, words):
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+def blob(rng, size):
+    """Tool output of about size bytes: log-like lines"""
+    lines = []
+    total = 0
+    while total < size:
+        line = rng.choice(LOG_LINES)
+        lines.append(line)
+        total += len(line) + 1
+    return "\n".join(lines)
+
+def message(role, text):
+    item_type = 'input_text' if role == 'user' else 'output_text'
+    return {"type": "message", "role": role, "content": [{"type": item_type, "text": text}]}
+
+def header_records(session_id, timestamp, cwd):
+    return [
+        {"id": session_id, "timestamp": timestamp.strftime("%Y-%m-%dT%H:%M:%SZ"), "instructions": None},
+        {"record_type": "state"},
+        message('user', "<user_instructions>Keep changes small.</user_instructions>"),
+        message('user', f"<environment_context>\n  <cwd>{cwd}</cwd>\n  <approval_policy>on-request</approval_policy>\n</environment_context>"),
+    ]
+
+def turn_records(rng, turn, tool_ratio, output_bytes):
+    """One user turn: a request, tool calls with their outputs, reasoning and a reply
+
+    tool_ratio is the mean number of tool calls per user message; outputs
+    vary between half and one and a half times output_bytes.
+    """
+    records = [message('user', f"Step {turn}: {sentence(rng, rng.randint(6, 40))}")]
+    calls = int(tool_ratio) + (rng.random() < tool_ratio - int(tool_ratio))
+    for call in range(calls):
+        call_id = f"call_{turn}_{call}"
+        command = rng.choice(COMMANDS)
+        records.append({"type": "function_call", "name": "shell",
+                        "arguments": json.dumps({"command": ["bash", "-lc", command]}), "call_id": call_id})
+        size = rng.randint(output_bytes // 2, output_bytes * 3 // 2)
+        output = json.dumps({"output": blob(rng, size), "metadata": {"exit_code": 0}})
+        records.append({"type": "function_call_output", "call_id": call_id, "output": output})
+    if rng.random() < 0.5:
+        records.append({"type": "reasoning", "summary": sentence(rng, 12)})
+    else:
+        records.append({"type": "reasoning", "summary": [], "encrypted_content": "gAAAA" + "x" * 64})
+    records.append(message('assistant', f"{sentence(rng, rng.randint(10, 80))}\n```py\nprint({turn})\n```"))
+    records.append({"record_type": "state"})
+    return records
+
+def write_rollout(path, size_bytes, cwd='/bench', tool_ratio=1.0, output_bytes=8000, seed=0,
+                  session_id='bench', timestamp=BASE_TIME):
+    """Write a rollout of at least size_bytes; returns the number of records"""
+    rng = random.Random(seed)
+    written = 0
+    count = 0
+    turn = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        records = header_records(session_id, timestamp, cwd)
+        while True:
+            for data in records:
+                written += f.write(json.dumps(data, ensure_ascii=False, separators=(',', ':')) + "\n")
+                count += 1
+            if written >= size_bytes:
+                return count
+            turn += 1
+            records = turn_records(rng, turn, tool_ratio, output_bytes)
+
+def write_sessions(root, sessions, size_bytes, cwds=('/bench',), tool_ratio=1.0, output_bytes=8000, seed=0):
+    """Fill root (a sessions directory) with date-partitioned rollouts
+
+    Session i is SESSION_GAP * i older than BASE_TIME and belongs to
+    cwds[i % len(cwds)]; mtimes match the timestamps.  Returns a list of
+    (path, cwd, records), newest first.
+    """
+    rng = random.Random(seed)
+    written = []
+    for i in range(sessions):
+        timestamp = BASE_TIME - SESSION_GAP * i
+        session_id = str(uuid.UUID(int=rng.getrandbits(128), version=4))
+        directory = Path(root) / timestamp.strftime("%Y/%m/%d")
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"rollout-{timestamp.strftime('%Y-%m-%dT%H-%M-%S')}-{session_id}.jsonl"
+        cwd = cwds[i % len(cwds)]
+        records = write_rollout(path, size_bytes, cwd, tool_ratio, output_bytes,
+                                seed=rng.getrandbits(32), session_id=session_id, timestamp=timestamp)
+        mtime = timestamp.timestamp()
+        os.utime(path, (mtime, mtime))
+        written.append((path, cwd, records))
+    return written
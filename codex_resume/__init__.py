@@ -0,0 +1,3 @@
+"""
+Codex Resume - Shared helpers for the codex-resume scripts
+"""
@@ -0,0 +1,127 @@
+"""
+Codex Resume Artifact - Context file plus a manifest of token-sized chunks
+The manifest records line/byte offsets, tokens and checksums for every chunk
+"""
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from codex_resume.settings import env_int
+from codex_resume.tokens import count_tokens
+
+CONTEXT_FILE = Path.home() / ".codex" / "last-context.txt"
+MANIFEST_FILE = Path.home() / ".codex" / "last-context.manifest.json"
+MANIFEST_VERSION = 1
+# Each chunk is one read for Codex; keep it well inside a single tool result
+CHUNK_TOKENS = env_int('CODEX_RESUME_CHUNK_TOKENS', 20000, minimum=1)
+
+class ContextWriter:
+    """Writes context parts to the artifact, cutting chunks by token count
+
+    Every part is written as its own line(s) followed by a newline.  A chunk
+    always ends on a part boundary, so a single huge part can make its
+    chunk larger than chunk_tokens.
+    """
+    
+    def __init__(self, path=CONTEXT_FILE, manifest_path=MANIFEST_FILE, chunk_tokens=CHUNK_TOKENS):
+        self.path = Path(path)
+        self.manifest_path = Path(manifest_path)
+        self.chunk_tokens = chunk_tokens
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.file = open(self.path, 'wb')
+        self.chunks = []
+        self.counts = {}
+        self.offset = 0
+        self.line = 1
+        self.chars = 0
+        self.tokens = 0
+        self.chunk = None
+    
+    def start_chunk(self):
+        self.chunk = {
+            'index': len(self.chunks) + 1,
+            'first_line': self.line,
+            'offset': self.offset,
+            'chars': 0,
+            'tokens': 0,
+        }
+        self.digest = hashlib.sha256()
+    
+    def finish_chunk(self):
+        if self.chunk is None:
+            return
+        self.chunk['last_line'] = self.line - 1
+        self.chunk['bytes'] = self.offset - self.chunk['offset']
+        self.chunk['sha256'] = self.digest.hexdigest()
+        self.chunks.append(self.chunk)
+        self.chunk = None
+    
+    def write(self, part, kind=None):
+        """Append one part; kind ('user', 'tool_output', ...) is tallied in the manifest"""
+        tokens = count_tokens(part)
+        if self.chunk is not None and self.chunk['tokens'] and self.chunk['tokens'] + tokens > self.chunk_tokens:
+            self.finish_chunk()
+        if self.chunk is None:
+            self.start_chunk()
+        
+        text = part + "\n"
+        data = text.encode('utf-8', 'surrogatepass')
+        self.file.write(data)
+        self.digest.update(data)
+        
+        self.offset += len(data)
+        self.line += text.count("\n")
+        self.chars += len(text)
+        self.tokens += tokens
+        self.chunk['chars'] += len(text)
+        self.chunk['tokens'] += tokens
+        if kind is not None:
+            self.counts[kind] = self.counts.get(kind, 0) + 1
+    
+    def close(self, **extra):
+        """Finish the file and write the manifest; returns the manifest"""
+        self.finish_chunk()
+        self.file.close()
+        stat = os.stat(self.path)
+        manifest = {
+            'version': MANIFEST_VERSION,
+            'file': str(self.path),
+            'size': stat.st_size,
+            'mtime': stat.st_mtime_ns,
+            'lines': self.line - 1,
+            'chars': self.chars,
+            'tokens': self.tokens,
+            'counts': self.counts,
+            'chunks': self.chunks,
+        }
+        manifest.update(extra)
+        tmp_file = self.manifest_path.with_name(self.manifest_path.name + f".{os.getpid()}.tmp")
+        with open(tmp_file, 'w') as f:
+            json.dump(manifest, f, indent=1)
+        os.replace(tmp_file, self.manifest_path)
+        return manifest
+
+def load_manifest(manifest_path=MANIFEST_FILE):
+    """The manifest, or None if it is missing or no longer matches its file"""
+    try:
+        with open(manifest_path, 'r') as f:
+            manifest = json.load(f)
+        stat = os.stat(manifest['file'])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    if manifest.get('version') != MANIFEST_VERSION:
+        return None
+    if stat.st_size != manifest.get('size') or stat.st_mtime_ns != manifest.get('mtime'):
+        return None
+    return manifest
+
+def read_chunk(manifest, index):
+    """Text of chunk number index (1-based), checked against its sha256"""
+    chunk = manifest['chunks'][index - 1]
+    with open(manifest['file'], 'rb') as f:
+        f.seek(chunk['offset'])
+        data = f.read(chunk['bytes'])
+    if hashlib.sha256(data).hexdigest() != chunk['sha256']:
+        raise ValueError(f"Chunk {index} of {manifest['file']} does not match its checksum")
+    return data.decode('utf-8', 'surrogatepass')
@@ -0,0 +1,175 @@
+"""
+Codex Resume Cache - Extracted transcripts keyed by rollout fingerprint
+Entries are marshal+zlib files under ~/.codex/resume-cache, evicted LRU by total size
+
+Each entry also records the byte offset and parser state the extractor
+reached, so a rollout that grew since the last run only has its appended
+lines parsed.
+"""
+import base64
+import hashlib
+import marshal
+import operator
+import os
+import zlib
+from pathlib import Path
+
+from codex_resume import client
+from codex_resume.profile import count, phase
+from codex_resume.settings import env_int
+
+CACHE_DIR = Path.home() / ".codex" / "resume-cache"
+# Total bytes kept on disk; 0 disables the cache
+CACHE_BYTES = env_int('CODEX_RESUME_CACHE_BYTES', 256 * 1024 * 1024)
+# Largest single entry worth keeping; rollouts whose full store would pass it
+# are streamed instead of cached
+CACHE_ENTRY_BYTES = env_int('CODEX_RESUME_CACHE_ENTRY_BYTES', 32 * 1024 * 1024)
+CACHE_FORMAT = 2
+# Bytes before the checkpoint that must be unchanged for an append to be trusted
+TAIL_CHECK_BYTES = 4096
+
+def cache_key(session_file, name, version):
+    """(path, extractor, version) - one cache slot per rollout and extractor"""
+    return (str(Path(session_file).resolve()), name, version)
+
+def entry_path(key, cache_dir):
+    digest = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+    return Path(cache_dir) / f"{digest}.bin"
+
+def tail_digest(session_file, end):
+    """Hash of the bytes just before offset end"""
+    start = max(0, end - TAIL_CHECK_BYTES)
+    with open(session_file, 'rb') as f:
+        f.seek(start)
+        return hashlib.sha1(f.read(end - start)).hexdigest()
+
+def load(key, cache_dir=CACHE_DIR):
+    """Cached value for key, or None"""
+    path = entry_path(key, cache_dir)
+    try:
+        with open(path, 'rb') as f:
+            stored_format, stored_key, value = marshal.loads(zlib.decompress(f.read()))
+    except (OSError, ValueError, EOFError, TypeError, zlib.error):
+        return None
+    if stored_format != CACHE_FORMAT or tuple(stored_key) != key:
+        return None
+    # Bump mtime so eviction sees this entry as recently used
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+    return value
+
+def store(key, value, cache_dir=CACHE_DIR, max_bytes=None):
+    """Write value for key, then evict the least recently used entries"""
+    max_bytes = CACHE_BYTES if max_bytes is None else max_bytes
+    path = entry_path(key, cache_dir)
+    tmp_file = path.with_name(path.name + f".{os.getpid()}.tmp")
+    try:
+        payload = zlib.compress(marshal.dumps((CACHE_FORMAT, key, value)), 1)
+        if len(payload) > min(max_bytes, CACHE_ENTRY_BYTES):
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_file, 'wb') as f:
+            f.write(payload)
+        os.replace(tmp_file, path)
+    except (OSError, ValueError):
+        try:
+            tmp_file.unlink()
+        except OSError:
+            pass
+        return
+    evict(cache_dir, max_bytes)
+
+def evict(cache_dir=CACHE_DIR, max_bytes=None):
+    """Delete least recently used entries until the cache fits in max_bytes"""
+    max_bytes = CACHE_BYTES if max_bytes is None else max_bytes
+    entries = []
+    for path in Path(cache_dir).glob("*.bin"):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        entries.append((stat.st_mtime_ns, stat.st_size, path))
+    
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+        if total <= max_bytes:
+            break
+        try:
+            path.unlink()
+        except OSError:
+            pass
+        total -= size
+
+def is_append(session_file, entry, stat):
+    """True if the rollout only grew since entry was cached"""
+    if entry['ino'] != stat.st_ino or stat.st_size < entry['end']:
+        return False
+    try:
+        return tail_digest(session_file, entry['end']) == entry['tail']
+    except OSError:
+        return False
+
+def encode_items(items):
+    """items as JSON-safe text, for sending over the daemon socket"""
+    return base64.b64encode(marshal.dumps(items)).decode('ascii')
+
+def decode_items(text):
+    return marshal.loads(base64.b64decode(text))
+
+@phase('cache')
+def cached_extract(session_file, name, version, extract, merge=None):
+    """(items, state) for a rollout, reusing whatever the cache already parsed
+
+    extract(session_file, start, state) parses from byte offset start onward
+    and returns (items, state, checkpoint); checkpoint is None when the file
+    ended mid-line, in which case nothing is cached this time.  merge(old,
+    new) joins cached items with those parsed from an append and defaults to
+    +.  A running daemon is asked first, since it may hold the transcript in
+    memory.  items must be marshal-able.
+    """
+    merge = operator.add if merge is None else merge
+    reply = client.request('extract', session=str(session_file), name=name, version=version)
+    if reply is not None:
+        count(daemon_hits=1)
+        return decode_items(reply['items']), reply['state']
+    if CACHE_BYTES <= 0:
+        items, state, _ = extract(session_file, 0, None)
+        return items, state
+    try:
+        stat = os.stat(session_file)
+    except OSError:
+        items, state, _ = extract(session_file, 0, None)
+        return items, state
+    
+    key = cache_key(session_file, name, version)
+    entry = load(key)
+    if entry is not None and entry['size'] == stat.st_size and entry['mtime'] == stat.st_mtime_ns:
+        count(cache_hits=1)
+        return entry['items'], entry['state']
+    
+    if entry is not None and is_append(session_file, entry, stat):
+        # Parse only what was appended and merge it into the cached records
+        count(cache_appends=1)
+        new_items, state, checkpoint = extract(session_file, entry['end'], entry['state'])
+        items = merge(entry['items'], new_items)
+    else:
+        count(cache_misses=1)
+        items, state, checkpoint = extract(session_file, 0, None)
+    
+    if checkpoint is not None:
+        try:
+            tail = tail_digest(session_file, checkpoint)
+        except OSError:
+            return items, state
+        store(key, {
+            'size': stat.st_size,
+            'mtime': stat.st_mtime_ns,
+            'ino': stat.st_ino,
+            'end': checkpoint,
+            'tail': tail,
+            'items': items,
+            'state': state,
+        })
+    return items, state
@@ -0,0 +1,241 @@
+"""
+Codex Resume CLI - Command-line handling shared by every codex-resume command
+Discovery, --list, --session and --help behave the same in every mode; a
+mode only supplies how to resume one session
+"""
+import json
+import subprocess
+import sys
+from collections import namedtuple
+from datetime import datetime
+from pathlib import Path
+
+from codex_resume import profile
+from codex_resume.index import find_sessions_for_directory, list_sessions_for_directory
+from codex_resume.profile import phase
+from codex_resume.search import search_sessions
+
+# command: name shown in messages; resume(session, sessions): load one session
+# (sessions holds the newest `recent` ones for context); resuming: message
+# printed before resuming a --session pick; list_hint: last line of --list
+Mode = namedtuple('Mode', ['command', 'resume', 'recent', 'resuming', 'list_hint', 'help'])
+
+# --list shows this many sessions unless --limit says otherwise
+LIST_LIMIT = 10
+# --search shows this many sessions unless --limit says otherwise
+SEARCH_LIMIT = 5
+
+# Shown after every mode's --help
+LIST_HELP = """LISTING:
+  --list --limit N          Show N sessions (default 10)
+  --list --offset N         Skip the newest N sessions, for the next page
+  --list --json             Print the page as JSON, with counts, token
+                            estimate and first-prompt preview per session
+
+SEARCHING:
+  --search "QUERY"          Rank sessions from every directory whose messages
+                            or tool calls contain all the words, with the
+                            matching turns (same --limit/--offset/--json)
+  --session PATH            Resume a rollout shown by --search
+"""
+
+# Shown after every mode's --help
+TIMINGS_HELP = """PROFILING:
+  --timings                 Print per-phase timings to stderr when done
+  --timings=FILE            Append the timings to FILE as JSON lines instead
+  --cprofile=FILE           Also write cProfile stats to FILE
+  (or set CODEX_RESUME_PROFILE=1|FILE and CODEX_RESUME_CPROFILE=FILE)
+"""
+
+def get_session_timestamp(filepath):
+    """Sort key from rollout-YYYY-MM-DDTHH-MM-SS-uuid.jsonl, else the mtime"""
+    name = filepath.name
+    try:
+        if 'rollout-' in name:
+            timestamp_part = name.split('rollout-')[1][:19]
+            return timestamp_part.replace('T', ' ').replace('-', '')
+    except:
+        pass
+    return str(filepath.stat().st_mtime)
+
+@phase('discover')
+def recent_sessions(current_dir, limit):
+    """The newest limit sessions for current_dir, most recent first"""
+    sessions = find_sessions_for_directory(current_dir, limit=limit)
+    sessions.sort(key=get_session_timestamp, reverse=True)
+    return sessions
+
+@phase('codex')
+def run_codex(*args):
+    """Hand over to codex; returns once the codex session ends"""
+    subprocess.run(["codex", *args])
+
+def resume(mode, session=None):
+    """Resume session, or the most recent one for the current directory"""
+    current_dir = Path.cwd()
+    print(f"Looking for sessions in: {current_dir}")
+    
+    sessions = [session] if session is not None else recent_sessions(current_dir, mode.recent)
+    if not sessions:
+        print(f"No previous sessions found for this directory.")
+        print("Starting fresh codex...")
+        run_codex()
+        return
+    
+    mode.resume(sessions[0], sessions)
+
+def parse_page_options(args, limit):
+    """(limit, offset, as_json, words) from the arguments after --list or --search
+
+    words are the arguments that are not options; None if an option is invalid.
+    """
+    offset, as_json, words = 0, False, []
+    args = list(args)
+    while args:
+        option = args.pop(0)
+        if option == '--json':
+            as_json = True
+            continue
+        if not option.startswith('--'):
+            words.append(option)
+            continue
+        if option not in ('--limit', '--offset') or not args:
+            return None
+        try:
+            value = int(args.pop(0))
+        except ValueError:
+            return None
+        if value < 0 or (option == '--limit' and value == 0):
+            return None
+        if option == '--limit':
+            limit = value
+        else:
+            offset = value
+    return limit, offset, as_json, words
+
+def format_count(value):
+    return '?' if value is None else f"{value:,}"
+
+def list_sessions(mode, args=()):
+    options = parse_page_options(args, LIST_LIMIT)
+    if options is None or options[3]:
+        print(f"Invalid list options. Use: {mode.command} --list [--limit N] [--offset N] [--json]")
+        return
+    limit, offset, as_json, _ = options
+    
+    current_dir = Path.cwd()
+    with phase('discover'):
+        rows, more = list_sessions_for_directory(current_dir, limit, offset)
+    
+    if as_json:
+        sessions = []
+        for i, row in enumerate(rows, offset + 1):
+            session = dict({'number': i}, **row)
+            session['modified'] = datetime.fromtimestamp(row['modified']).isoformat(timespec='seconds')
+            sessions.append(session)
+        print(json.dumps({'cwd': str(current_dir), 'offset': offset, 'limit': limit, 'more': more,
+                          'sessions': sessions}, indent=2))
+        return
+    
+    if not rows:
+        if offset:
+            print(f"No sessions past number {offset} for {current_dir}")
+        else:
+            print(f"No sessions found for {current_dir}")
+        return
+    
+    print(f"\nSessions for {current_dir}:")
+    for i, row in enumerate(rows, offset + 1):
+        mtime = datetime.fromtimestamp(row['modified'])
+        size_mb = row['size'] / 1024 / 1024
+        print(f"{i}. {row['name']}")
+        print(f"   Modified: {mtime.strftime('%Y-%m-%d %H:%M:%S')} | Size: {size_mb:.2f} MB")
+        print(f"   {format_count(row['messages'])} messages, {format_count(row['tools'])} tool calls, "
+              f"~{format_count(row['tokens'])} tokens")
+        if row['preview']:
+            print(f"   > {row['preview']}")
+    if more:
+        print(f"\nMore sessions: {mode.command} --list --offset {offset + limit}")
+    print(f"\n{mode.list_hint}")
+
+def search(mode, args):
+    options = parse_page_options(args, SEARCH_LIMIT)
+    if options is None or not options[3]:
+        print(f'Use: {mode.command} --search "QUERY" [--limit N] [--offset N] [--json]')
+        return
+    limit, offset, as_json, words = options
+    query = " ".join(words)
+    
+    with phase('search'):
+        results, more = search_sessions(query, limit, offset)
+    
+    if as_json:
+        sessions = [dict({'number': i}, **result) for i, result in enumerate(results, offset + 1)]
+        print(json.dumps({'query': query, 'offset': offset, 'limit': limit, 'more': more,
+                          'sessions': sessions}, indent=2))
+        return
+    
+    if not results:
+        print(f"No sessions match: {query}")
+        return
+    
+    print(f"\nSessions matching: {query}")
+    for i, result in enumerate(results, offset + 1):
+        print(f"{i}. {result['name']} ({result['hits']} matching turns)")
+        started = (result['started'] or '?').replace('T', ' ')
+        print(f"   {result['cwd']} | Started: {started}")
+        for match in result['matches']:
+            print(f"   turn {match['turn']} of {result['turns']} ({match['kind']}): {match['snippet']}")
+        print(f"   Resume: {mode.command} --session {result['path']}")
+    if more:
+        print(f"\nMore results: {mode.command} --search \"{query}\" --offset {offset + limit}")
+
+def select_session(mode, number):
+    """Resume session number (1-based, as shown by --list), or a rollout path from --search"""
+    if number.endswith('.jsonl') and Path(number).is_file():
+        if mode.resuming:
+            print(f"{mode.resuming}: {Path(number).name}")
+        resume(mode, Path(number))
+        return
+    try:
+        session_num = int(number) - 1
+    except ValueError:
+        session_num = -1
+    if session_num < 0:
+        print(f"Invalid session number. Use: {mode.command} --session <number>")
+        return
+    
+    current_dir = Path.cwd()
+    matching = recent_sessions(current_dir, session_num + 1)
+    if not matching:
+        print(f"No sessions found for {current_dir}")
+    elif session_num < len(matching):
+        selected_session = matching[session_num]
+        if mode.resuming:
+            print(f"{mode.resuming}: {selected_session.name}")
+        resume(mode, selected_session)
+    else:
+        print(f"Invalid session number. Available: 1-{len(matching)}")
+
+def run(mode, args=None):
+    """Entry point for a codex-resume command"""
+    args = sys.argv[1:] if args is None else args
+    args, output, cprofile_file = profile.split_options(args)
+    with profile.session(mode.command, args, output, cprofile_file):
+        dispatch(mode, args)
+
+def dispatch(mode, args):
+    if not args:
+        resume(mode)
+    elif args[0] == '--list':
+        list_sessions(mode, args[1:])
+    elif args[0] == '--search':
+        search(mode, args[1:])
+    elif args[0] == '--session' and len(args) > 1:
+        select_session(mode, args[1])
+    elif args[0] == '--help':
+        print(mode.help)
+        print(LIST_HELP)
+        print(TIMINGS_HELP)
+    else:
+        print(f"Unknown option: {args[0]}. Use --help for usage.")
@@ -0,0 +1,45 @@
+"""
+Codex Resume Client - Talks to the optional resume daemon over its Unix socket
+Every call returns None when the daemon is not running, so callers fall back
+to doing the work in-process
+"""
+import json
+import os
+import socket
+from pathlib import Path
+
+from codex_resume.profile import phase
+
+SOCKET_FILE = Path(os.environ.get('CODEX_RESUME_SOCKET', Path.home() / ".codex" / "resume.sock"))
+# Set CODEX_RESUME_DAEMON=0 to never contact the daemon
+ENABLED = os.environ.get('CODEX_RESUME_DAEMON', '1') != '0'
+# A live daemon accepts at once; anything slower is treated as down
+CONNECT_TIMEOUT = 0.2
+# A cold extraction of a large rollout can take a while
+REPLY_TIMEOUT = 60
+
+def send(sock, message):
+    """Write one request or reply as a single JSON line"""
+    sock.sendall(json.dumps(message).encode('utf-8') + b"\n")
+
+def request(op, **args):
+    """Reply dict from the daemon for op, or None if it is down or failed"""
+    if not ENABLED or not SOCKET_FILE.exists():
+        return None
+    with phase(f"daemon {op}"):
+        return send_request(op, args)
+
+def send_request(op, args):
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(CONNECT_TIMEOUT)
+            sock.connect(str(SOCKET_FILE))
+            sock.settimeout(REPLY_TIMEOUT)
+            send(sock, dict(args, op=op))
+            with sock.makefile('rb') as f:
+                reply = json.loads(f.readline())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(reply, dict) or not reply.get('ok'):
+        return None
+    return reply
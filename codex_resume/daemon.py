@@ -0,0 +1,240 @@
+"""
+Codex Resume Daemon - Keeps the session index and recent transcripts warm
+Answers session lookups and extractions over a Unix socket; the scripts reach
+it through codex_resume.client and work without it when it is not running
+
+Run with: python3 -m codex_resume.daemon [--status | --stop]
+"""
+import argparse
+import json
+import os
+import socketserver
+import sys
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+from codex_resume import cache, client, pipeline, search
+from codex_resume.index import SessionIndex, file_signature, newest_first
+from codex_resume.settings import env_int
+from codex_resume.watch import InotifyWatcher
+
+# Extractors the daemon can run, by cache name: (version, extract, merge)
+EXTRACTORS = {
+    'entries': (pipeline.ENTRIES_VERSION, pipeline.extract_entries, pipeline.merge_entries),
+    'messages': (pipeline.ENTRIES_VERSION, pipeline.extract_messages, pipeline.merge_entries),
+}
+# Extracted transcripts kept in memory
+TRANSCRIPTS = env_int('CODEX_RESUME_DAEMON_TRANSCRIPTS', 8)
+
+class ResumeService:
+    """The daemon's state: a warm SessionIndex and an LRU of transcripts"""
+    
+    def __init__(self, index, max_transcripts=TRANSCRIPTS):
+        self.index = index
+        self.max_transcripts = max_transcripts
+        self.transcripts = OrderedDict()
+        self.lock = threading.Lock()
+        # Syncs of the search index run one at a time, outside the index lock
+        self.search_lock = threading.Lock()
+        self.started = time.time()
+        self.watcher = None
+    
+    def watch(self):
+        """Keep the index current from inotify events; falls back to polling"""
+        try:
+            self.watcher = InotifyWatcher(self.index.sessions_dir)
+        except OSError:
+            return False
+        with self.lock:
+            self.index.refresh()
+            self.index.save()
+        threading.Thread(target=self.follow, daemon=True).start()
+        return True
+    
+    def follow(self):
+        while True:
+            changed = self.watcher.wait()
+            if not changed:
+                continue
+            with self.lock:
+                if None in changed:
+                    # Events were lost; only a full rescan is trustworthy
+                    self.index.refresh(full=True)
+                else:
+                    self.index.apply(changed)
+                self.index.save()
+    
+    def sessions(self, cwd, limit=None):
+        with self.lock:
+            if self.watcher is None:
+                # No events to rely on; poll directory mtimes instead
+                self.index.refresh()
+                self.index.save()
+            sessions = self.index.sessions_for(cwd)
+        if limit is not None:
+            sessions = newest_first(sessions)[:limit]
+        return [str(session_file) for session_file in sessions]
+    
+    def listing(self, cwd, limit, offset=0):
+        """(rows, more) for one --list page; metadata is cached in the index"""
+        with self.lock:
+            if self.watcher is None:
+                self.index.refresh()
+            sessions = newest_first(self.index.sessions_for(cwd))
+            rows = [self.index.describe(session_file) for session_file in sessions[offset:offset + limit]]
+            self.index.save()
+        return rows, len(sessions) > offset + limit
+    
+    def search(self, query, limit, offset=0):
+        """(results, more) for one --search page, syncing the search index first"""
+        with self.lock:
+            if self.watcher is None:
+                self.index.refresh()
+                self.index.save()
+            entries = dict(self.index.entries)
+        with self.search_lock, search.SearchIndex() as index:
+            index.sync(entries)
+            return index.query(query, limit, offset)
+    
+    def extract(self, session, name, version):
+        current, extract, merge = EXTRACTORS[name]
+        if version != current:
+            # The client loaded different filters or code; let it work alone
+            raise ValueError(f"extractor {name} is at version {current}, not {version}")
+        key = (session, name, version)
+        sig = file_signature(os.stat(session))
+        with self.lock:
+            hit = self.transcripts.get(key)
+            if hit is not None and hit[0] == sig:
+                self.transcripts.move_to_end(key)
+                return hit[1], hit[2]
+        
+        items, state = cache.cached_extract(session, name, version, extract, merge)
+        with self.lock:
+            self.transcripts[key] = (sig, items, state)
+            self.transcripts.move_to_end(key)
+            while len(self.transcripts) > self.max_transcripts:
+                self.transcripts.popitem(last=False)
+        return items, state
+    
+    def status(self):
+        with self.lock:
+            return {
+                'pid': os.getpid(),
+                'uptime': round(time.time() - self.started, 1),
+                'sessions': len(self.index.entries),
+                'transcripts': len(self.transcripts),
+                'watching': self.watcher is not None,
+            }
+    
+    def handle(self, message):
+        """Reply dict for one request"""
+        op = message.get('op')
+        if op == 'ping':
+            return {'ok': True, **self.status()}
+        if op == 'sessions':
+            return {'ok': True, 'sessions': self.sessions(message['cwd'], message.get('limit'))}
+        if op == 'list':
+            rows, more = self.listing(message['cwd'], message['limit'], message.get('offset', 0))
+            return {'ok': True, 'sessions': rows, 'more': more}
+        if op == 'search':
+            results, more = self.search(message['query'], message['limit'], message.get('offset', 0))
+            return {'ok': True, 'sessions': results, 'more': more}
+        if op == 'extract':
+            items, state = self.extract(message['session'], message['name'], message['version'])
+            return {'ok': True, 'items': cache.encode_items(items), 'state': state}
+        return {'ok': False, 'error': f"unknown op {op!r}"}
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    """One JSON line in, one JSON line out"""
+    
+    def handle(self):
+        stopping = False
+        try:
+            message = json.loads(self.rfile.readline())
+            if message.get('op') == 'shutdown':
+                stopping = True
+                reply = {'ok': True}
+            else:
+                reply = self.server.service.handle(message)
+        except Exception as error:
+            # A bad request or rollout must never take the daemon down
+            reply = {'ok': False, 'error': f"{type(error).__name__}: {error}"}
+        try:
+            client.send(self.connection, reply)
+        except OSError:
+            pass
+        if stopping:
+            # Reply first: the process exits as soon as serve_forever returns
+            threading.Thread(target=self.server.shutdown).start()
+
+class ResumeServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+    
+    def __init__(self, socket_file, service):
+        self.service = service
+        # Only the owner may connect; transcripts are private
+        umask = os.umask(0o177)
+        try:
+            super().__init__(str(socket_file), RequestHandler)
+        finally:
+            os.umask(umask)
+
+def serve(socket_file=None):
+    socket_file = Path(socket_file or client.SOCKET_FILE)
+    if client.request('ping') is not None:
+        print(f"Daemon already running on {socket_file}")
+        return 1
+    # Requests this process makes for itself must not loop back to the socket
+    client.ENABLED = False
+    
+    socket_file.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        socket_file.unlink()  # Left behind by a daemon that died
+    except FileNotFoundError:
+        pass
+    
+    service = ResumeService(SessionIndex.load())
+    if not service.watch():
+        service.sessions('')  # Warm the index before the first client asks
+    server = ResumeServer(socket_file, service)
+    print(f"Codex resume daemon listening on {socket_file} (pid {os.getpid()})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        try:
+            socket_file.unlink()
+        except OSError:
+            pass
+    return 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Keep the Codex resume index and transcripts warm")
+    parser.add_argument('--status', action='store_true', help="show whether the daemon is running")
+    parser.add_argument('--stop', action='store_true', help="stop a running daemon")
+    args = parser.parse_args(argv)
+    
+    if args.status:
+        reply = client.request('ping')
+        if reply is None:
+            print("Daemon not running")
+            return 1
+        mode = "inotify" if reply['watching'] else "polling"
+        print(f"Daemon running: pid {reply['pid']}, up {reply['uptime']}s, {mode}, "
+              f"{reply['sessions']} sessions indexed, {reply['transcripts']} transcripts warm")
+        return 0
+    if args.stop:
+        if client.request('shutdown') is None:
+            print("Daemon not running")
+            return 1
+        print("Daemon stopped")
+        return 0
+    return serve()
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+"""
+Codex Resume Decode - Pluggable JSON backend for rollout lines
+Uses orjson or msgspec when installed, stdlib json otherwise
+"""
+import json
+import os
+import re
+
+BACKEND = os.environ.get('CODEX_RESUME_JSON', '')
+
+def _load_backend(preferred):
+    """(name, loads, errors) for the first usable backend"""
+    candidates = [preferred] if preferred else ['orjson', 'msgspec', 'json']
+    for name in candidates:
+        if name == 'orjson':
+            try:
+                import orjson
+            except ImportError:
+                continue
+            return name, orjson.loads, (ValueError,)
+        if name == 'msgspec':
+            try:
+                import msgspec
+            except ImportError:
+                continue
+            return name, msgspec.json.Decoder().decode, (ValueError, msgspec.DecodeError)
+    return 'json', json.loads, (ValueError,)
+
+BACKEND, loads, DECODE_ERRORS = _load_backend(BACKEND)
+
+# Codex writes compact JSON with the record type as the first key, so the
+# type can be read off the raw bytes before deciding to decode the line.
+TYPE_PATTERN = re.compile(rb'\s*\{\s*"(?:type|record_type)"\s*:\s*"([A-Za-z_]*)"')
+# Decoded strings pair surrogates up, so any left over is a lone one
+SURROGATE_PATTERN = re.compile('[\ud800-\udfff]')
+
+def peek_type(buffer, start=0, end=None):
+    """Record type of the line buffer[start:end], or None when it isn't the leading key
+
+    buffer may be an mmap; nothing is copied out of it.
+    """
+    end = len(buffer) if end is None else end
+    match = TYPE_PATTERN.match(buffer, start, end)
+    if match:
+        return match.group(1).decode('ascii')
+    return None
+
+def replace_surrogates(text):
+    """text with any lone surrogate replaced by U+FFFD, so it encodes as UTF-8"""
+    return SURROGATE_PATTERN.sub('\ufffd', text)
+
+def decode_line(line, types=None):
+    """Decode one raw rollout line into a dict, or None if it is skipped
+
+    When types is given, lines whose leading type is not in it are dropped
+    without being decoded at all.
+    """
+    return decode_span(line, 0, len(line), types)
+
+def decode_span(buffer, start, end, types=None):
+    """decode_line for the line buffer[start:end] of a larger buffer
+
+    The line is copied out of buffer (typically an mmap of the rollout) only
+    once its type says it will be decoded.
+    """
+    if types is not None:
+        record_type = peek_type(buffer, start, end)
+        if record_type is not None and record_type not in types:
+            return None
+    line = buffer[start:end]
+    if not line or line.isspace():
+        return None
+    try:
+        data = loads(line)
+    except DECODE_ERRORS:
+        if loads is json.loads:
+            return None
+        # orjson and msgspec reject lone surrogates (e.g. "\ud83d" from a
+        # truncated emoji) that json accepts and Codex does write
+        try:
+            data = json.loads(line)
+        except ValueError:
+            return None
+    if not isinstance(data, dict):
+        return None
+    if types is not None and (data.get('type') or data.get('record_type')) not in types:
+        return None
+    return data
@@ -0,0 +1,105 @@
+"""
+Codex Resume Dedup - Content-addressed tool outputs for full-context mode
+Repeats become back-references, near-repeats become diffs against the last version
+"""
+import difflib
+import hashlib
+import itertools
+import os
+import re
+
+DEDUP = os.environ.get('CODEX_RESUME_DEDUP', '1') != '0'
+# Outputs shorter than this are cheaper to repeat than to reference
+MIN_CHARS = 200
+# Use a diff only when it is at most this fraction of the full output
+MAX_DIFF_RATIO = 0.5
+# difflib gets slow on very long outputs; send those in full
+MAX_DIFF_LINES = 5000
+
+HUNK_HEADER = re.compile(r'@@ -(\d+)(?:,(\d+))? \+\d+(?:,\d+)? @@')
+
+def split_lines(text):
+    """Lines of an output; JSON-wrapped outputs split on their escaped newlines"""
+    lines = text.splitlines()
+    if len(lines) == 1 and '\\n' in text:
+        return text.split('\\n')
+    return lines
+
+def make_diff(old, new):
+    """Unified diff (no context lines) from old to new, or None if too costly"""
+    old_lines = split_lines(old)
+    new_lines = split_lines(new)
+    if max(len(old_lines), len(new_lines)) > MAX_DIFF_LINES:
+        return None
+    diff = difflib.unified_diff(old_lines, new_lines, lineterm='', n=0)
+    # Drop the ---/+++ file header; changed lines may start with -- or ++ too
+    diff = "\n".join(itertools.islice(diff, 2, None))
+    if apply_diff(old_lines, diff) != new_lines:
+        return None
+    return diff
+
+def apply_diff(old_lines, diff):
+    """The lines make_diff() was given as new, rebuilt from old_lines and its diff"""
+    lines = []
+    position = 0
+    for line in diff.split("\n") if diff else []:
+        header = HUNK_HEADER.fullmatch(line)
+        if header:
+            start, length = int(header[1]), int(header[2] or 1)
+            # An empty old range names the line the insertion follows
+            start = start if length == 0 else start - 1
+            lines.extend(old_lines[position:start])
+            position = start
+        elif line.startswith('-'):
+            position += 1
+        elif line.startswith('+'):
+            lines.append(line[1:])
+    lines.extend(old_lines[position:])
+    return lines
+
+class OutputDeduper:
+    """Numbers tool outputs and replaces repeats with short references
+
+    Every output long enough to matter is tagged [#N].  An output with the
+    same hash as an earlier one becomes a back-reference to it; one that
+    differs a little from the last output of the same command becomes a
+    diff against it.  Nothing is lost: each reference points at text that
+    appears earlier in the context.
+    """
+    
+    def __init__(self, min_chars=MIN_CHARS, max_diff_ratio=MAX_DIFF_RATIO):
+        self.min_chars = min_chars
+        self.max_diff_ratio = max_diff_ratio
+        self.by_digest = {}
+        self.latest = {}
+        self.count = 0
+        self.saved_chars = 0
+        self.references = 0
+    
+    def add(self, text, key=None):
+        """Text to emit for the next tool output; key groups runs of one command"""
+        self.count += 1
+        number = self.count
+        if len(text) < self.min_chars:
+            return text
+        
+        digest = hashlib.sha1(text.encode('utf-8', 'surrogatepass')).hexdigest()
+        previous = self.latest.get(key) if key is not None else None
+        if key is not None:
+            self.latest[key] = (number, text)
+        
+        if digest in self.by_digest:
+            rendered = f"[#{number}: identical to output #{self.by_digest[digest]}, sha1 {digest[:10]}]"
+        else:
+            self.by_digest[digest] = number
+            rendered = None
+            if previous is not None:
+                diff = make_diff(previous[1], text)
+                if diff is not None and len(diff) <= self.max_diff_ratio * len(text):
+                    rendered = f"[#{number}: output #{previous[0]} with these changes]\n{diff}"
+            if rendered is None:
+                return f"[#{number}] {text}"
+        
+        self.references += 1
+        self.saved_chars += len(text) - len(rendered)
+        return rendered
@@ -0,0 +1,152 @@
+"""
+Codex Resume Filters - Compiled meta-message rules shared by every mode
+Defaults can be extended from ~/.codex/resume-filters.json
+"""
+import hashlib
+import json
+import os
+import sys
+from pathlib import Path
+
+FILTERS_FILE = Path(os.environ.get('CODEX_RESUME_FILTERS', Path.home() / ".codex" / "resume-filters.json"))
+
+# Messages injected by earlier resumes or by Codex itself, not real conversation
+DEFAULT_RULES = {
+    'user': {
+        'prefix': [
+            '<environment_context',
+            '<user_instructions>',
+        ],
+        'contains': [
+            '=== CONTEXT FROM PREVIOUS SESSION ===',
+            '=== PREVIOUS SESSION CONTEXT ===',
+            '=== CONTINUING FROM PREVIOUS SESSION ===',
+            '=== END OF CONTEXT ===',
+            'Project instructions already loaded',
+            'Continue from where we left off',
+            'Recent conversation:',
+            'This is for context only',
+            "I'm ready to continue",
+        ],
+        'exact': [
+            '[Project configuration and guidelines loaded]',
+            '[Project instructions provided]',
+        ],
+    },
+    'assistant': {
+        'prefix': [],
+        'contains': [
+            "I've got the project context loaded",
+            "Ready to continue. What should I tackle next?",
+            "Great—what do you want to enable",
+            "I'll start by scanning",
+            "Got it — I've reviewed the context",
+        ],
+        'exact': [],
+    },
+}
+
+def build_automaton(patterns):
+    """Aho-Corasick automaton over patterns, or None without pyahocorasick"""
+    if not patterns:
+        return None
+    try:
+        import ahocorasick
+    except ImportError:
+        return None
+    automaton = ahocorasick.Automaton()
+    for pattern in patterns:
+        automaton.add_word(pattern, pattern)
+    automaton.make_automaton()
+    return automaton
+
+class MessageFilter:
+    """One role's meta-message rules, compiled for a single check per text
+
+    Substring rules run through an Aho-Corasick automaton (one pass over the
+    text) when pyahocorasick is installed.  Otherwise each rule is a separate
+    str.__contains__ scan, which in CPython still beats a combined regex
+    alternation by a wide margin on long texts.
+    """
+    
+    def __init__(self, prefix=(), contains=(), exact=()):
+        self.prefixes = tuple(prefix)
+        self.exact = frozenset(text.strip() for text in exact)
+        self.exact_max = max([len(text) for text in self.exact] or [0])
+        self.contains = tuple(contains)
+        self.automaton = build_automaton(self.contains)
+    
+    def matches(self, text):
+        """True if text is a meta message under these rules"""
+        if self.prefixes and text.startswith(self.prefixes):
+            return True
+        # Only short texts can equal an exact rule; skip stripping huge pastes
+        if self.exact and len(text) <= self.exact_max + 64 and text.strip() in self.exact:
+            return True
+        if self.automaton is not None:
+            for _ in self.automaton.iter(text):
+                return True
+            return False
+        for pattern in self.contains:
+            if pattern in text:
+                return True
+        return False
+
+class MetaFilters:
+    """User and assistant filters plus a digest for cache keys"""
+    
+    def __init__(self, rules):
+        self.rules = rules
+        self.user = MessageFilter(**rules['user'])
+        self.assistant = MessageFilter(**rules['assistant'])
+        self.digest = hashlib.sha1(json.dumps(rules, sort_keys=True).encode('utf-8')).hexdigest()[:12]
+
+def warn(path, problem):
+    print(f"Ignoring {problem} in {path}", file=sys.stderr)
+
+def role_patterns(path, role, role_config, kind):
+    """The user's extra kind patterns for role; malformed values are skipped with a warning"""
+    patterns = role_config.get(kind, [])
+    if not isinstance(patterns, list):
+        warn(path, f"{role}.{kind} (expected a list of strings)")
+        return []
+    extra = []
+    for pattern in patterns:
+        if isinstance(pattern, str) and pattern:
+            extra.append(pattern)
+        else:
+            warn(path, f"{role}.{kind} entry {pattern!r} (expected a non-empty string)")
+    return extra
+
+def load_filters(path=FILTERS_FILE):
+    """Default rules extended (or replaced) by the user's config file
+
+    The file looks like {"user": {"contains": ["..."]}, "assistant": {...}};
+    each role takes prefix, contains and exact lists.  Set
+    "replace_defaults": true to drop the built-in rules.  Anything malformed
+    is reported on stderr and left out, so a bad file never stops a resume.
+    """
+    try:
+        with open(path, 'r') as f:
+            config = json.load(f)
+    except OSError:
+        config = {}
+    except ValueError as e:
+        warn(path, f"invalid JSON ({e})")
+        config = {}
+    if not isinstance(config, dict):
+        warn(path, "the config (expected a JSON object)")
+        config = {}
+    
+    rules = {}
+    for role, defaults in DEFAULT_RULES.items():
+        role_config = config.get(role, {})
+        if not isinstance(role_config, dict):
+            warn(path, f"the {role} section (expected an object of prefix/contains/exact lists)")
+            role_config = {}
+        rules[role] = {}
+        for kind, patterns in defaults.items():
+            extra = role_patterns(path, role, role_config, kind)
+            base = [] if config.get('replace_defaults') else list(patterns)
+            rules[role][kind] = base + [pattern for pattern in extra if pattern not in base]
+    return MetaFilters(rules)
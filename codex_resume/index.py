@@ -0,0 +1,530 @@
+"""
+Codex Resume Index - Persistent cwd -> session index for ~/.codex/sessions
+Only rollouts whose (size, mtime, inode) changed since the last run are re-scanned
+"""
+import functools
+import json
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from codex_resume import client
+from codex_resume.decode import decode_span, peek_type, replace_surrogates
+from codex_resume.pipeline import MESSAGE_KINDS, initial_state, iter_entries
+from codex_resume.profile import count, phase
+from codex_resume.records import iter_spans, make_record, map_file
+from codex_resume.settings import env_int
+from codex_resume.tokens import count_tokens
+
+SESSIONS_DIR = Path.home() / ".codex" / "sessions"
+INDEX_FILE = Path.home() / ".codex" / "resume-index.json"
+INDEX_VERSION = 5
+
+# The environment_context message sits at the top of every rollout, so
+# discovery only reads this many bytes of each file.  0 means full scan.
+HEADER_BYTES = env_int('CODEX_RESUME_HEADER_BYTES', 64 * 1024)
+
+CWD_PATTERN = re.compile(rb'<cwd>(.*?)</cwd>', re.S)
+MESSAGE_MARKERS = (b'"type":"message"', b'"type": "message"')
+# Anything after these has passed the point where the cwd would be recorded
+HEADER_END_MARKERS = (b'<environment_context', b'"role":"assistant"', b'"role": "assistant"')
+# --list shows this much of each session's first prompt
+PREVIEW_CHARS = 80
+# Metadata fields computed on first listing and cached until the rollout changes
+METADATA_FIELDS = ('messages', 'tools', 'tokens', 'preview')
+
+# Refreshes only list directories whose mtime changed and re-stat rollouts
+# that were recently active; everything is re-stat'd at least this often
+# so appends to old sessions are eventually picked up.
+RESCAN_SECONDS = env_int('CODEX_RESUME_RESCAN_SECONDS', 3600)
+ACTIVE_SECONDS = 24 * 3600
+# A directory modified this recently may still change within the same
+# mtime tick, so it is listed again next time
+SETTLE_SECONDS = 2
+
+# Discovery is dominated by per-file latency (stat + a small read), which
+# threads overlap well even on network-mounted home directories.
+WORKERS = env_int('CODEX_RESUME_WORKERS', 0) or os.cpu_count() or 1
+
+def session_start(session_file):
+    """Comparable start time taken from rollout-YYYY-MM-DDTHH-MM-SS-uuid.jsonl"""
+    name = Path(session_file).name
+    if 'rollout-' in name:
+        timestamp_part = name.split('rollout-')[1][:19]
+        return timestamp_part.replace('T', ' ').replace('-', '')
+    return None
+
+def file_signature(stat):
+    """The (size, mtime, inode) triple that decides whether a rollout is re-scanned"""
+    return [stat.st_size, stat.st_mtime_ns, stat.st_ino]
+
+def only_grew(entry, stat):
+    """True if the indexed rollout was appended to rather than replaced"""
+    size, _, ino = entry['sig']
+    return ino == stat.st_ino and stat.st_size >= size
+
+def is_message_line(line):
+    return any(marker in line for marker in MESSAGE_MARKERS)
+
+def decode_cwd(raw):
+    """Turn the JSON-escaped bytes between <cwd> and </cwd> into a path"""
+    try:
+        return json.loads(b'"' + raw + b'"').strip()
+    except ValueError:
+        return raw.decode('utf-8', 'replace').strip()
+
+def find_cwd_in_lines(lines):
+    """Raw byte search for <cwd> inside message records; no JSON decode per line"""
+    for line in lines:
+        if b'<cwd>' in line and is_message_line(line):
+            match = CWD_PATTERN.search(line)
+            if match:
+                return decode_cwd(match.group(1))
+    return None
+
+def read_cwd(session_file, max_bytes=None):
+    """Find the session cwd by reading only the first max_bytes of the rollout"""
+    if max_bytes is None:
+        max_bytes = HEADER_BYTES
+    
+    with open(session_file, 'rb') as f:
+        if max_bytes > 0:
+            prefix = f.read(max_bytes)
+            lines = prefix.split(b'\n')
+            complete = lines[:-1] if len(prefix) == max_bytes else lines
+            cwd = find_cwd_in_lines(complete)
+            if cwd is not None:
+                return cwd
+            # Seeing the environment_context or the first assistant reply
+            # without a <cwd> is a plain miss.  Anything else means an unusual
+            # layout (e.g. a huge instructions header), so scan the whole file.
+            if len(prefix) < max_bytes:
+                return None
+            if any(marker in line for line in complete for marker in HEADER_END_MARKERS):
+                return None
+            f.seek(0)
+        return find_cwd_in_lines(f)
+
+def read_metadata(session_file):
+    """Counts, tokens and the first real prompt from one raw pass
+
+    Lines are classified by their leading type and only message lines are
+    decoded, so tool outputs are never parsed.  messages and tokens count
+    the conversation exactly as the lightweight resume does: meta messages
+    are filtered out, and a message with several text items counts its last.
+    """
+    with open(session_file, 'rb') as f:
+        buffer = map_file(f)
+        if buffer is None:
+            return scan_metadata(f.read())
+        with buffer:
+            return scan_metadata(buffer)
+
+def scan_metadata(buffer):
+    messages = tools = tokens = 0
+    preview = None
+    state = initial_state()
+    for start, end in iter_spans(buffer):
+        record_type = peek_type(buffer, start, end)
+        if record_type == 'function_call':
+            tools += 1
+            continue
+        if record_type != 'message':
+            continue
+        data = decode_span(buffer, start, end)
+        if data is None:
+            continue
+        last_text = None
+        for kind, text, _ in iter_entries([make_record(data)], state):
+            if kind not in MESSAGE_KINDS:
+                continue
+            last_text = text
+            if preview is None and kind == 'user':
+                preview = text
+        if last_text is not None:
+            messages += 1
+            tokens += count_tokens(last_text)
+    if preview is not None:
+        preview = " ".join(replace_surrogates(preview).split())
+        if len(preview) > PREVIEW_CHARS:
+            preview = preview[:PREVIEW_CHARS - 3] + "..."
+    return {'messages': messages, 'tools': tools, 'tokens': tokens, 'preview': preview}
+
+def format_start(start):
+    """session_start() as YYYY-MM-DDTHH:MM:SS, or None"""
+    if not start or len(start) != 15:
+        return None
+    return f"{start[:4]}-{start[4:6]}-{start[6:8]}T{start[9:11]}:{start[11:13]}:{start[13:15]}"
+
+def parallel_map(func, items, workers=WORKERS):
+    """map() over a worker pool; results come back in input order"""
+    if workers <= 1 or len(items) < 2:
+        return [func(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(workers, len(items))) as pool:
+        return list(pool.map(func, items))
+
+def stat_session(session_file):
+    try:
+        return session_file.stat()
+    except OSError:
+        return None
+
+def walk_dirs(root, known, now):
+    """Walk the sessions tree, listing only directories whose mtime changed
+
+    known maps directory -> mtime_ns from the previous walk.  Returns
+    (dirs, listed): the new directory map, and {directory: rollout names}
+    for every directory that had to be listed.
+    """
+    children = {}
+    for path in known:
+        children.setdefault(os.path.dirname(path), []).append(path)
+    
+    dirs = {}
+    listed = {}
+    pending = [str(root)]
+    while pending:
+        path = pending.pop()
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            continue
+        settled = now - mtime / 1e9 > SETTLE_SECONDS
+        dirs[path] = mtime if settled else None
+        if known.get(path) == mtime:
+            pending.extend(children.get(path, []))
+            continue
+        names = []
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        pending.append(entry.path)
+                    elif entry.name.endswith('.jsonl'):
+                        names.append(entry.name)
+        except OSError:
+            continue
+        listed[path] = names
+    return dirs, listed
+
+def newest_first(session_files):
+    """Sort rollouts by the timestamp in their name, most recent first"""
+    return sorted(session_files, key=lambda path: session_start(path) or '', reverse=True)
+
+def iter_partitions(root):
+    """Yield the rollouts of each directory under root, newest partition first
+
+    The sessions tree is laid out as YYYY/MM/DD, so walking names in reverse
+    visits days newest first.  Rollouts sitting outside the date partitions
+    (the older flat layout) come after everything partitioned below them.
+    """
+    try:
+        with os.scandir(root) as entries:
+            entries = list(entries)
+    except OSError:
+        return
+    for subdir in sorted((entry.path for entry in entries if entry.is_dir()), reverse=True):
+        yield from iter_partitions(subdir)
+    files = [Path(entry.path) for entry in entries
+             if entry.name.endswith('.jsonl') and not entry.is_dir()]
+    if files:
+        yield newest_first(files)
+
+def scan_header(session_file, header_bytes=None):
+    """(found, cwd) for one rollout; found is False if it vanished or is unreadable"""
+    try:
+        return True, read_cwd(session_file, header_bytes)
+    except OSError:
+        return False, None
+
+class SessionIndex:
+    """On-disk map of rollout path -> cwd, start time, size, mtime and counts"""
+    
+    def __init__(self, path=INDEX_FILE, sessions_dir=SESSIONS_DIR, header_bytes=None, workers=None):
+        self.path = Path(path)
+        self.sessions_dir = Path(sessions_dir)
+        self.header_bytes = HEADER_BYTES if header_bytes is None else header_bytes
+        self.workers = WORKERS if workers is None else workers
+        self.entries = {}
+        self.dirs = {}
+        self.scanned = 0
+        self.dirty = False
+    
+    @classmethod
+    def load(cls, path=INDEX_FILE, sessions_dir=SESSIONS_DIR, header_bytes=None, workers=None):
+        index = cls(path, sessions_dir, header_bytes, workers)
+        try:
+            with open(index.path, 'r') as f:
+                data = json.load(f)
+            if data.get('version') == INDEX_VERSION:
+                index.entries = data.get('sessions', {})
+                index.dirs = data.get('dirs', {})
+                index.scanned = data.get('scanned', 0)
+        except (OSError, ValueError):
+            # Missing or corrupt index - rebuild from scratch
+            index.entries = {}
+        return index
+    
+    def save(self):
+        """Atomically write the index; an unwritable ~/.codex only costs a rescan"""
+        if not self.dirty:
+            return
+        tmp_file = self.path.with_name(self.path.name + f".{os.getpid()}.tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_file, 'w') as f:
+                json.dump({
+                    'version': INDEX_VERSION,
+                    'sessions': self.entries,
+                    'dirs': self.dirs,
+                    'scanned': self.scanned,
+                }, f)
+            os.replace(tmp_file, self.path)
+            self.dirty = False
+        except OSError:
+            try:
+                tmp_file.unlink()
+            except OSError:
+                pass
+    
+    def is_stale(self, session_file, stat):
+        """True when the rollout's signature changed since it was indexed"""
+        entry = self.entries.get(str(session_file))
+        if entry is None or entry.get('sig') != file_signature(stat):
+            return True
+        # A miss under a smaller byte budget deserves another look
+        return entry.get('cwd') is None and entry.get('scan') != self.header_bytes
+    
+    def store(self, session_file, stat, cwd):
+        entry = {
+            'cwd': cwd,
+            'sig': file_signature(stat),
+            'scan': self.header_bytes,
+            'size': stat.st_size,
+            'mtime': stat.st_mtime,
+            'start': session_start(session_file),
+        }
+        entry.update(dict.fromkeys(METADATA_FIELDS))
+        self.entries[str(session_file)] = entry
+        self.dirty = True
+        return entry
+    
+    def grow(self, session_file, stat):
+        """Record an append; the header, and so the cwd, is unchanged"""
+        entry = self.entries[str(session_file)]
+        entry.update(dict.fromkeys(METADATA_FIELDS))
+        entry.update({
+            'sig': file_signature(stat),
+            'size': stat.st_size,
+            'mtime': stat.st_mtime,
+        })
+        self.dirty = True
+        return entry
+    
+    def needs_header(self, session_file, stat):
+        """True if a stale rollout must have its header re-read"""
+        entry = self.entries.get(str(session_file))
+        return entry is None or entry.get('cwd') is None or not only_grew(entry, stat)
+    
+    def update(self, session_file, stat):
+        """Re-scan a single rollout if its signature changed"""
+        if not self.is_stale(session_file, stat):
+            return self.entries[str(session_file)]
+        if not self.needs_header(session_file, stat):
+            return self.grow(session_file, stat)
+        found, cwd = scan_header(session_file, self.header_bytes)
+        if not found:
+            self.forget(session_file)
+            return None
+        return self.store(session_file, stat, cwd)
+    
+    def forget(self, session_file):
+        if self.entries.pop(str(session_file), None) is not None:
+            self.dirty = True
+    
+    def refresh(self, full=None):
+        """Bring the index in line with the sessions tree
+
+        Only directories whose mtime changed are listed, and only rollouts
+        in those, rollouts active in the last day and rollouts without a
+        cwd yet are re-stat'd.  full forces a complete rescan, which also
+        happens every RESCAN_SECONDS.
+        """
+        now = time.time()
+        if full is None:
+            full = now - self.scanned >= RESCAN_SECONDS
+        dirs, listed = walk_dirs(self.sessions_dir, {} if full else self.dirs, now)
+        if dirs != self.dirs:
+            self.dirs = dirs
+            self.dirty = True
+        if full:
+            self.scanned = now
+            self.dirty = True
+        
+        candidates = set()
+        for directory, names in listed.items():
+            candidates.update(os.path.join(directory, name) for name in names)
+        for key, entry in list(self.entries.items()):
+            directory = os.path.dirname(key)
+            if directory not in dirs or (directory in listed and key not in candidates):
+                # Deleted, or its directory no longer lists it
+                self.forget(key)
+            elif entry.get('cwd') is None or now - entry.get('mtime', 0) < ACTIVE_SECONDS:
+                candidates.add(key)
+        
+        session_files = [Path(key) for key in sorted(candidates)]
+        stats = parallel_map(stat_session, session_files, self.workers)
+        count(files=len(session_files), dirs=len(listed))
+        
+        stale = []
+        for session_file, stat in zip(session_files, stats):
+            if stat is None:
+                self.forget(session_file)
+            elif self.is_stale(session_file, stat):
+                if self.needs_header(session_file, stat):
+                    stale.append((session_file, stat))
+                else:
+                    self.grow(session_file, stat)
+        
+        # Header reads fan out over the pool; results are merged in path order
+        scans = parallel_map(functools.partial(scan_header, header_bytes=self.header_bytes),
+                             [session_file for session_file, _ in stale], self.workers)
+        count(headers=len(stale))
+        for (session_file, stat), (found, cwd) in zip(stale, scans):
+            if found:
+                self.store(session_file, stat, cwd)
+            else:
+                self.forget(session_file)
+    
+    def apply(self, paths):
+        """Update the entries for rollouts a watcher reported as changed"""
+        for path in paths:
+            if not path.endswith('.jsonl'):
+                continue
+            session_file = Path(path)
+            stat = stat_session(session_file)
+            if stat is None:
+                self.forget(session_file)
+            else:
+                self.update(session_file, stat)
+    
+    def metadata(self, session_file):
+        """read_metadata() for a rollout, computed lazily so discovery stays header-only"""
+        entry = self.entries.get(str(session_file))
+        if entry is None:
+            return read_metadata(session_file)
+        if entry.get('messages') is None:
+            try:
+                entry.update(read_metadata(session_file))
+            except OSError:
+                return dict.fromkeys(METADATA_FIELDS)
+            self.dirty = True
+            count(metadata=1)
+        return {field: entry[field] for field in METADATA_FIELDS}
+    
+    def describe(self, session_file):
+        """One --list row: timestamps, size and metadata of an indexed rollout"""
+        entry = self.entries[str(session_file)]
+        return dict(
+            self.metadata(session_file),
+            path=str(session_file),
+            name=Path(session_file).name,
+            started=format_start(entry.get('start')),
+            modified=entry['mtime'],
+            size=entry['size'],
+        )
+    
+    def listing(self, current_dir, limit, offset=0):
+        """(rows, more): one --list page for current_dir, newest first
+
+        Only the partitions holding the first offset + limit + 1 matches are
+        read, and metadata is computed just for the rows on the page.
+        """
+        sessions = self.recent_sessions_for(current_dir, offset + limit + 1)
+        rows = [self.describe(session_file) for session_file in sessions[offset:offset + limit]]
+        return rows, len(sessions) > offset + limit
+    
+    def recent_sessions_for(self, current_dir, limit):
+        """The newest limit rollouts for current_dir
+
+        An existing index answers after a refresh(), which skips directories
+        whose mtime is unchanged.  Without one, date partitions are visited
+        newest first and the walk stops once limit matches are found, so a
+        first run doesn't wait on a scan of all history.
+        """
+        if self.entries:
+            self.refresh()
+            return newest_first(self.sessions_for(current_dir))[:limit]
+        return self.walk_recent(current_dir, limit)
+    
+    def walk_recent(self, current_dir, limit):
+        current_dir = str(current_dir)
+        matches = []
+        for session_files in iter_partitions(self.sessions_dir):
+            stats = parallel_map(stat_session, session_files, self.workers)
+            stale = [(session_file, stat) for session_file, stat in zip(session_files, stats)
+                     if stat is not None and self.is_stale(session_file, stat)]
+            needs_scan = [(session_file, stat) for session_file, stat in stale
+                          if self.needs_header(session_file, stat)]
+            scans = parallel_map(functools.partial(scan_header, header_bytes=self.header_bytes),
+                                 [session_file for session_file, _ in needs_scan], self.workers)
+            count(files=len(session_files), headers=len(needs_scan))
+            scanned = {str(session_file): (stat, result)
+                       for (session_file, stat), result in zip(needs_scan, scans)}
+            
+            for session_file, stat in zip(session_files, stats):
+                if stat is None:
+                    self.forget(session_file)
+                    continue
+                if str(session_file) in scanned:
+                    stat, (found, cwd) = scanned[str(session_file)]
+                    entry = self.store(session_file, stat, cwd) if found else None
+                else:
+                    entry = self.update(session_file, stat)
+                if entry is not None and entry.get('cwd') == current_dir:
+                    matches.append(session_file)
+                    if len(matches) >= limit:
+                        return matches
+        return matches
+    
+    def sessions_for(self, current_dir):
+        """Rollouts whose recorded cwd is current_dir"""
+        current_dir = str(current_dir)
+        return [Path(key) for key, entry in sorted(self.entries.items())
+                if entry.get('cwd') == current_dir]
+
+def find_sessions_for_directory(current_dir, limit=None):
+    """Find sessions that were run in the current directory
+
+    With a limit only the newest limit sessions are returned, newest first,
+    and only as much of the tree as that takes is read.
+    """
+    reply = client.request('sessions', cwd=str(current_dir), limit=limit)
+    if reply is not None:
+        return [Path(session_file) for session_file in reply['sessions']]
+    with phase('index load'):
+        index = SessionIndex.load()
+    with phase('index scan'):
+        if limit is not None:
+            sessions = index.recent_sessions_for(current_dir, limit)
+        else:
+            index.refresh()
+            sessions = index.sessions_for(current_dir)
+    with phase('index save'):
+        index.save()
+    return sessions
+
+def list_sessions_for_directory(current_dir, limit, offset=0):
+    """(rows, more) for one page of --list; see SessionIndex.listing"""
+    reply = client.request('list', cwd=str(current_dir), limit=limit, offset=offset)
+    if reply is not None:
+        return reply['sessions'], reply['more']
+    with phase('index load'):
+        index = SessionIndex.load()
+    with phase('index scan'):
+        rows, more = index.listing(current_dir, limit, offset)
+    with phase('index save'):
+        index.save()
+    return rows, more
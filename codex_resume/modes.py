@@ -0,0 +1,288 @@
+"""
+Codex Resume Modes - The four ways of resuming a session
+Each mode is a view over the shared entry stream plus how it hands the
+context to Codex; the codex-resume-* scripts just run one of these
+"""
+from datetime import datetime
+
+from codex_resume.artifact import ContextWriter
+from codex_resume.cli import Mode, run_codex
+from codex_resume.dedup import DEDUP, OutputDeduper
+from codex_resume.delivery import deliver, deliver_written
+from codex_resume.profile import phase
+from codex_resume.tokens import count_tokens
+from codex_resume.views import (extract_full_session, extract_important_content, extract_key_messages,
+                                extract_real_conversation, iter_context_parts, pack_key_messages,
+                                render_conversation, render_key_messages)
+
+# Context part kinds that come from session entries
+RECORD_KINDS = ('user', 'assistant', 'tool_call', 'tool_output', 'reasoning', 'instruction')
+# Chunked mode: contexts above this are packed down to the messages that fit
+TOKEN_LIMIT = 12500
+
+def resume_lightweight(latest, sessions):
+    print(f"\nAll sessions for this directory (most recent first):")
+    for i, session in enumerate(sessions[:3], 1):
+        print(f"  {i}. {session.name}")
+    
+    print(f"Latest: {latest.name}")
+    print(f"File size: {latest.stat().st_size} bytes")
+    print(f"Modified: {datetime.fromtimestamp(latest.stat().st_mtime).strftime('%Y-%m-%d %H:%M:%S')}")
+    
+    messages = extract_real_conversation(latest)
+    
+    if not messages:
+        print("No real conversation found. Starting fresh...")
+        run_codex()
+        return
+    
+    print(f"Found {len(messages)} messages (user + assistant)")
+    
+    total_tokens = sum(count_tokens(msg['text']) for msg in messages)
+    print(f"Loading ENTIRE session: {len(messages)} messages (~{total_tokens:,} tokens)")
+    
+    resume_message = render_conversation(messages)
+    
+    print("\nStarting codex with previous context...")
+    print("(Context loaded - codex will wait for your instruction)")
+    deliver(resume_message)
+
+FULL_INSTRUCTION = """🔴 CRITICAL: Load the COMPLETE session context - EVERY SINGLE LINE 🔴
+
+File to read: {context_file}
+
+File info:
+- Size: {chars:,} characters (~{tokens:,} tokens)  
+- Lines: {line_count}
+- MUST BE READ COMPLETELY - NO SKIPPING
+
+EFFICIENT LOADING METHOD:
+1. Use your file reading capability (📖) to read these line ranges, in order:
+{chunk_list}
+2. Each range is sized to fit one read, so this takes only {chunks_needed} operations
+3. DO NOT stop early - read ENTIRE file
+
+CRITICAL: This file contains calculation results, tool outputs, and decision history.
+Missing ANY part could break our work continuity.
+
+VERIFICATION AFTER LOADING:
+After reading the file, please confirm by showing:
+1. Total lines read: should be {line_count}
+2. Found "=== FULL SESSION HISTORY ===" marker
+3. Found "=== END OF HISTORY ===" marker
+4. Approximate tokens loaded
+
+Example response: "Loaded all {line_count} lines (~{tokens:,} tokens) with start/end markers confirmed." """
+
+def resume_full(latest, sessions):
+    print(f"\nLatest: {latest.name}")
+    print(f"File size: {latest.stat().st_size / 1024 / 1024:.2f} MB")
+    
+    # Stream the rendered context to disk, counting lines and tokens on the way
+    deduper = OutputDeduper() if DEDUP else None
+    writer = ContextWriter()
+    with phase('extract'):
+        entries = extract_full_session(latest)
+    # Rollouts too large to cache are parsed as they are rendered
+    with phase('render'):
+        for kind, part in iter_context_parts(entries, deduper):
+            writer.write(part, kind)
+        manifest = writer.close(session=str(latest))
+    
+    counts = manifest['counts']
+    record_count = sum(counts.get(kind, 0) for kind in RECORD_KINDS)
+    if not record_count:
+        print("No conversation found. Starting fresh...")
+        run_codex()
+        return
+    
+    context_tokens = manifest['tokens']
+    print(f"Found {record_count} records (messages + tools + reasoning)")
+    
+    if deduper and deduper.references:
+        print(f"Deduplicated {deduper.references} repeated tool outputs (saved {deduper.saved_chars:,} chars)")
+    
+    print(f"\nFull context size: {manifest['chars']:,} chars (~{context_tokens:,} tokens)")
+    
+    # Passed inline when it fits on the command line, else read from the file
+    deliver_written(manifest, FULL_INSTRUCTION)
+
+def resume_direct(latest, sessions):
+    print(f"Loading session: {latest.name}")
+    
+    # Extract and format context
+    context = extract_important_content(latest)
+    
+    print(f"Context size: {len(context):,} characters (~{count_tokens(context):,} tokens)")
+    print("Sending directly to Codex...")
+    
+    # Send directly as command line argument when it fits
+    deliver(context)
+
+def resume_chunked(latest, sessions):
+    print(f"\nLatest: {latest.name}")
+    
+    messages = extract_key_messages(latest)
+    
+    if not messages:
+        print("No messages found. Starting fresh...")
+        run_codex()
+        return
+    
+    print(f"Found {len(messages)} key messages")
+    
+    context_parts = render_key_messages(messages)
+    resume_message = "\n".join(context_parts)
+    context_tokens = sum(count_tokens(part) for part in context_parts)
+    
+    # Check size and send directly
+    if context_tokens > TOKEN_LIMIT:
+        resume_message, kept = pack_key_messages(messages, TOKEN_LIMIT)
+        print(f"Context is large (~{context_tokens:,} tokens), keeping {kept} of {len(messages)} messages")
+    
+    print(f"Starting codex with {len(resume_message):,} chars of context...")
+    deliver(resume_message)
+
+
+LIGHTWEIGHT = Mode(
+    command='codex-resume',
+    resume=resume_lightweight,
+    recent=3,
+    resuming="Resuming session",
+    list_hint="To resume a specific session, use: codex-resume --session <number>",
+    help="""Codex Resume - Continue previous Codex sessions with conversation history
+
+DESCRIPTION:
+  Loads previous Codex session conversations for the current directory.
+  This lightweight version loads only user/assistant messages (~8K tokens).
+
+USAGE:
+  codex-resume              Resume the most recent session
+  codex-resume --list       List all available sessions for current directory
+  codex-resume --session N  Resume specific session number N from the list
+  codex-resume --help       Show this help message
+
+FEATURES:
+  • Directory-aware: Only shows sessions from current working directory
+  • Lightweight: Loads last ~30 messages (approx 8,000 tokens)
+  • Smart filtering: Removes meta messages and duplicates
+  • Clear context: Shows last exchange as reminder
+  • No auto-execution: Instructs Codex to wait for your command
+
+EXAMPLES:
+  codex-resume              # Resume last session in current directory
+  codex-resume --list       # Show all sessions with timestamps and sizes
+  codex-resume --session 2  # Resume the 2nd session from the list
+
+RELATED COMMANDS:
+  codex-resume-full         # Load FULL context including tool calls (~250K+ tokens)
+  codex-resume-full --list  # List sessions for full context loading
+  codex-chunked             # Alternative lightweight loader
+
+FILES:
+  Sessions stored in: ~/.codex/sessions/
+  Script location: /Users/btmacbookair/CascadeProjects/codex-resume-tool/
+
+NOTE: For complete session history including tool calls and outputs,
+      use 'codex-resume-full' instead (requires Read tool).
+""",
+)
+
+FULL = Mode(
+    command='codex-resume-full',
+    resume=resume_full,
+    recent=1,
+    resuming="Resuming session with FULL context",
+    list_hint="To resume a specific session with FULL context, use: codex-resume-full --session <number>",
+    help="""Codex Resume Full - Continue sessions with COMPLETE context
+
+DESCRIPTION:
+  Loads entire session history including messages, tool calls, and outputs.
+  This comprehensive version can load 250,000+ tokens of context.
+
+USAGE:
+  codex-resume-full              Resume the most recent session with full context
+  codex-resume-full --list       List all available sessions for current directory
+  codex-resume-full --session N  Resume specific session N with full context
+  codex-resume-full --help       Show this help message
+
+FEATURES:
+  • Complete history: All messages, tool calls, and outputs
+  • Large capacity: Handles up to ~250K+ tokens
+  • Tool tracking: Includes bash commands, file edits, etc.
+  • File-based loading: Uses ~/.codex/last-context.txt for large contexts
+  • Read tool required: Forces use of Read tool for reliable loading
+
+WHAT'S INCLUDED:
+  ✓ User/Assistant messages (all)
+  ✓ Tool calls (bash, edit, write, etc.)
+  ✓ Tool outputs and results
+  ✗ Encrypted reasoning blocks (not accessible)
+  ✗ State metadata (filtered out)
+
+EXAMPLES:
+  codex-resume-full              # Resume last session with full context
+  codex-resume-full --list       # Show sessions with sizes and timestamps
+  codex-resume-full --session 3  # Load session #3 with complete history
+
+READ TOOL REQUIREMENT:
+  This script instructs Codex to use the Read tool for loading context.
+  If Read tool is not available, Codex will notify you.
+  The Read tool should auto-approve and not require multiple confirmations.
+
+FILES:
+  Sessions: ~/.codex/sessions/
+  Temp context: ~/.codex/last-context.txt
+  Script: /Users/btmacbookair/CascadeProjects/codex-resume-tool/
+
+TOKEN USAGE:
+  Typical session: 50K-250K tokens
+  Large session: 250K-500K+ tokens
+  
+NOTE: For quick resume with lighter context (~8K tokens),
+      use 'codex-resume' instead.
+""",
+)
+
+DIRECT = Mode(
+    command='codex-resume-direct',
+    resume=resume_direct,
+    recent=1,
+    resuming=None,
+    list_hint="To load a specific session, use: codex-resume-direct --session <number>",
+    help="""Codex Resume Direct - Load context directly without file reading
+
+Usage:
+  codex-resume-direct           Load last session directly
+  codex-resume-direct --list    List available sessions
+  codex-resume-direct --session N  Load session N
+  codex-resume-direct --help    Show this help
+
+This version:
+- Sends context directly (no file reading)
+- Optimized size (20K tokens max)
+- Includes tool usage summary
+- No chunking issues
+""",
+)
+
+CHUNKED = Mode(
+    command='codex-resume-chunked',
+    resume=resume_chunked,
+    recent=1,
+    resuming=None,
+    list_hint="To load a specific session, use: codex-resume-chunked --session <number>",
+    help="""Codex Resume Chunked - Load the key messages of a session
+
+Usage:
+  codex-resume-chunked           Load last session's key messages
+  codex-resume-chunked --list    List available sessions
+  codex-resume-chunked --session N  Load session N
+  codex-resume-chunked --help    Show this help
+
+This version:
+- Sends the last 50 user/assistant messages directly
+- Trims to the most valuable messages above 12.5K tokens
+- No file reading or tool approvals needed
+""",
+)
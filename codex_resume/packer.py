@@ -0,0 +1,52 @@
+"""
+Codex Resume Packer - Pick the most useful records that fit a token budget
+Scores by recency, role and size, packs greedily by value density in O(n log n)
+"""
+import heapq
+from collections import namedtuple
+
+# age counts records back from the newest (0 = newest); tokens is the cost
+PackItem = namedtuple('PackItem', ['age', 'kind', 'text', 'tokens'])
+
+KIND_WEIGHTS = {
+    'user': 1.2,
+    'assistant': 1.0,
+    'tool_call': 0.6,
+    'tool_output': 0.4,
+}
+# Records this many steps back are worth half as much as the newest one
+HALF_LIFE = 40
+# Tokens beyond this add no value, so huge blobs lose to several smaller records
+VALUE_CAP = 512
+
+def score(item, half_life=HALF_LIFE, weights=KIND_WEIGHTS):
+    """Value of including item"""
+    recency = 0.5 ** (item.age / half_life)
+    return weights.get(item.kind, 0.5) * recency * min(item.tokens, VALUE_CAP)
+
+def pack(items, budget, half_life=HALF_LIFE, weights=KIND_WEIGHTS):
+    """Best-value subset of items within budget tokens, oldest first
+
+    Classic fractional-knapsack greedy: take items in order of value per
+    token and skip (rather than stop at) the ones that no longer fit.
+    """
+    heap = []
+    for index, item in enumerate(items):
+        if item.tokens > budget:
+            continue
+        density = score(item, half_life, weights) / max(item.tokens, 1)
+        # Ties go to the newer record
+        heap.append((-density, item.age, index))
+    heapq.heapify(heap)
+    
+    chosen = []
+    remaining = budget
+    while heap and remaining > 0:
+        _, _, index = heapq.heappop(heap)
+        item = items[index]
+        if item.tokens <= remaining:
+            chosen.append(item)
+            remaining -= item.tokens
+    
+    chosen.sort(key=lambda item: -item.age)
+    return chosen
@@ -0,0 +1,168 @@
+"""
+Codex Resume Pipeline - The one parse of a rollout that every mode shares
+Turns raw records into typed entries (user, assistant, tool calls, outputs,
+reasoning) with meta messages filtered out; modes are views over this stream
+"""
+import os
+
+from codex_resume.cache import CACHE_BYTES, CACHE_ENTRY_BYTES, cached_extract
+from codex_resume.filters import load_filters
+from codex_resume.profile import count, phase
+from codex_resume.records import MESSAGE_TYPES, RecordStream, iter_records_reverse
+from codex_resume.store import EntryStore, merge_dumps
+
+# Record types that produce entries; everything else is never decoded
+ENTRY_TYPES = frozenset(['message', 'function_call', 'function_call_output', 'reasoning'])
+# Entry types that come from conversation messages
+MESSAGE_KINDS = frozenset(['user', 'assistant'])
+# Bump whenever iter_entries output changes to invalidate the cache
+PIPELINE_VERSION = 4
+
+FILTERS = load_filters()
+# Cache version: the pipeline code plus the filter rules it applied
+ENTRIES_VERSION = f"{PIPELINE_VERSION}-{FILTERS.digest}"
+
+def initial_state():
+    return {'seen_instructions': False, 'messages': 0}
+
+def format_tool_call(data):
+    """Short one-line description of a function_call record"""
+    tool_name = data.get('name', 'unknown')
+    params = data.get('parameters', {})
+    
+    if tool_name == 'bash':
+        cmd = params.get('command', '')[:100]
+        return f"[TOOL: bash] {cmd}..."
+    if tool_name == 'edit_file':
+        return f"[TOOL: edit] {params.get('file_path', '')}"
+    return f"[TOOL: {tool_name}]"
+
+def iter_entries(records, state):
+    """Yield a (kind, text, message) entry for everything worth showing
+    
+    kind is user, assistant, instruction, tool_call, tool_output or
+    reasoning.  message is the number of the message an entry came from,
+    since one message can hold several content items, and -1 for entries
+    that are not messages.  state is updated in place.
+    """
+    for record in records:
+        data = record.data
+        record_type = record.type
+        
+        if record_type == 'message':
+            role = record.role
+            message = state['messages']
+            state['messages'] += 1
+            
+            for item in data.get('content', []):
+                # User messages
+                if item.get('type') == 'input_text' and role == 'user':
+                    text = item.get('text', '')
+                    if not text:
+                        continue
+                    if text.startswith('<user_instructions>'):
+                        # Only note that the project instructions were loaded, once
+                        if not state['seen_instructions']:
+                            state['seen_instructions'] = True
+                            yield 'instruction', '[Project configuration loaded]', message
+                    elif not FILTERS.user.matches(text):
+                        yield 'user', text, message
+                
+                # Assistant messages (output_text type for Codex)
+                elif item.get('type') == 'output_text' and role == 'assistant':
+                    text = item.get('text', '')
+                    if text and not FILTERS.assistant.matches(text):
+                        yield 'assistant', text, message
+        
+        elif record_type == 'function_call':
+            yield 'tool_call', format_tool_call(data), -1
+        
+        elif record_type == 'function_call_output':
+            output = data.get('output', '')
+            if output:
+                # Don't truncate - views decide how much to keep
+                yield 'tool_output', output, -1
+        
+        elif record_type == 'reasoning':
+            # Reasoning might be encrypted; only plain summaries are kept
+            summary = data.get('summary', '')
+            if summary and isinstance(summary, str):
+                yield 'reasoning', f"[THINKING] {summary}", -1
+
+@phase('parse')
+def extract_entries(session_file, start=0, state=None, types=ENTRY_TYPES):
+    """Every entry of a rollout as an EntryStore dump
+    
+    Parsing resumes at byte offset start with the state from an earlier call.
+    Returns (entries, state, checkpoint) as expected by cached_extract.
+    """
+    state = dict(state or initial_state())
+    stream = RecordStream(session_file, types, start)
+    entries = EntryStore()
+    for kind, text, message in iter_entries(stream, state):
+        entries.append(kind, text, message)
+    count(entries=len(entries))
+    return entries.dump(), state, stream.checkpoint
+
+def merge_entries(old, new):
+    """Cached entries followed by those parsed from an append"""
+    return merge_dumps(old, new)
+
+def extract_messages(session_file, start=0, state=None):
+    """extract_entries for the conversation-only views; tool lines are never decoded"""
+    return extract_entries(session_file, start, state, MESSAGE_TYPES)
+
+# Record types a view parses -> (cache name, extractor); anything else streams
+CACHED_VIEWS = {
+    ENTRY_TYPES: ('entries', extract_entries),
+    MESSAGE_TYPES: ('messages', extract_messages),
+}
+
+def fits_cache(session_file, types=ENTRY_TYPES):
+    """Whether the entries parsed for types come from the cache
+    
+    Messages are a small part of any rollout, so they are always cached;
+    the full store, tool outputs and all, only for rollouts up to
+    CACHE_ENTRY_BYTES.  Bigger ones stream, which costs less than building
+    and compressing a store that the cache would refuse anyway.
+    """
+    if CACHE_BYTES <= 0 or types not in CACHED_VIEWS:
+        return False
+    return types == MESSAGE_TYPES or os.path.getsize(session_file) <= CACHE_ENTRY_BYTES
+
+def load_store(session_file, types=ENTRY_TYPES):
+    """The cached EntryStore of a rollout's entries for types"""
+    name, extract = CACHED_VIEWS[types]
+    entries, _ = cached_extract(session_file, name, ENTRIES_VERSION, extract, merge_entries)
+    return EntryStore.load(entries)
+
+def load_entries(session_file, types=ENTRY_TYPES, kinds=None):
+    """(kind, text, message) entries in file order, shared through the cache
+    
+    kinds limits which entries are returned; text of other kinds is never
+    decoded.  types limits which records are parsed at all, and picks the
+    cached view; rollouts too large for it are streamed instead.
+    """
+    if fits_cache(session_file, types):
+        return load_store(session_file, types).select(kinds)
+    return only_kinds(iter_entries(RecordStream(session_file, types), initial_state()), kinds)
+
+def load_entries_reverse(session_file, types=MESSAGE_TYPES, kinds=None):
+    """Entries newest first
+    
+    The rollout is read backwards from the end of the file with only types
+    decoded, so the tail views stop as soon as they have enough and never
+    touch the rest of the session.
+    """
+    return only_kinds(reverse_entries(iter_records_reverse(session_file, types=types)), kinds)
+
+def only_kinds(entries, kinds):
+    if kinds is None:
+        return entries
+    return (entry for entry in entries if entry[0] in kinds)
+
+def reverse_entries(records):
+    """iter_entries over newest-first records, content items newest first too"""
+    state = initial_state()
+    for record in records:
+        yield from reversed(list(iter_entries([record], state)))
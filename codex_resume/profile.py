@@ -0,0 +1,143 @@
+"""
+Codex Resume Profile - Phase timings for --timings and CODEX_RESUME_PROFILE
+Records wall time, bytes read, lines parsed, records kept or dropped and peak
+memory per phase; nothing is measured unless profiling is switched on
+"""
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# 1 or table prints a table to stderr; anything else is a file to append JSON lines to
+OUTPUT = os.environ.get('CODEX_RESUME_PROFILE', '')
+# Also dump cProfile stats (pstats format) to this file
+CPROFILE = os.environ.get('CODEX_RESUME_CPROFILE', '')
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS reports bytes
+    return round(peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024, 1)
+
+class Profiler:
+    """Nested phases with wall time and counters; a no-op until enabled"""
+
+    def __init__(self):
+        self.enabled = False
+        self.phases = []
+        self.stack = []
+
+    @contextmanager
+    def phase(self, name):
+        """Time the enclosed block as phase name; also usable as a decorator"""
+        if not self.enabled:
+            yield
+            return
+        record = {'phase': name, 'depth': len(self.stack), 'ms': None, 'counters': {}}
+        self.phases.append(record)
+        self.stack.append(record)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            record['ms'] = round((time.perf_counter() - start) * 1000, 2)
+            record['peak_rss_mb'] = peak_rss_mb()
+            self.stack.pop()
+            # Counters are inclusive, like the times
+            if self.stack:
+                parent = self.stack[-1]['counters']
+                for key, value in record['counters'].items():
+                    parent[key] = parent.get(key, 0) + value
+
+    def count(self, **counters):
+        """Add to the counters of the innermost open phase"""
+        if not self.enabled or not self.stack:
+            return
+        current = self.stack[-1]['counters']
+        for key, value in counters.items():
+            current[key] = current.get(key, 0) + value
+
+    def table(self):
+        lines = [f"{'phase':<32} {'ms':>10} {'peak MB':>8}  counters"]
+        for record in self.phases:
+            name = "  " * record['depth'] + record['phase']
+            ms = '-' if record['ms'] is None else f"{record['ms']:.2f}"
+            peak = '-' if record.get('peak_rss_mb') is None else f"{record['peak_rss_mb']:.1f}"
+            counters = " ".join(f"{key}={format_count(key, value)}" for key, value in record['counters'].items())
+            lines.append(f"{name:<32} {ms:>10} {peak:>8}  {counters}".rstrip())
+        return "\n".join(lines)
+
+    def write_jsonl(self, path, command, args):
+        """Append one JSON line per phase, tagged with this run"""
+        run = {'time': datetime.now().isoformat(timespec='seconds'), 'pid': os.getpid(),
+               'command': command, 'args': args}
+        with open(os.path.expanduser(path), 'a') as f:
+            for record in self.phases:
+                f.write(json.dumps(dict(run, **record)) + "\n")
+
+def format_count(key, value):
+    if key == 'bytes':
+        return f"{value / 1024 / 1024:.1f}MB" if value >= 1024 * 1024 else f"{value / 1024:.1f}KB"
+    return f"{value:,}"
+
+PROFILER = Profiler()
+phase = PROFILER.phase
+count = PROFILER.count
+
+def split_options(args):
+    """(args, output, cprofile_file) with --timings[=FILE] and --cprofile=FILE taken out"""
+    output, cprofile_file = OUTPUT, CPROFILE
+    rest = []
+    for arg in args:
+        if arg == '--timings':
+            output = 'table'
+        elif arg.startswith('--timings='):
+            output = arg.split('=', 1)[1]
+        elif arg.startswith('--cprofile='):
+            cprofile_file = arg.split('=', 1)[1]
+        else:
+            rest.append(arg)
+    if output == '0':
+        output = ''
+    return rest, output, cprofile_file
+
+@contextmanager
+def session(command, args, output, cprofile_file=''):
+    """Profile the enclosed run of command and report when it ends"""
+    if not output and not cprofile_file:
+        yield
+        return
+    profiler = None
+    if cprofile_file:
+        import cProfile
+        profiler = cProfile.Profile()
+    PROFILER.enabled = True
+    try:
+        with phase(command):
+            if profiler is not None:
+                profiler.enable()
+            try:
+                yield
+            finally:
+                if profiler is not None:
+                    profiler.disable()
+    finally:
+        PROFILER.enabled = False
+        if profiler is not None:
+            profiler.dump_stats(cprofile_file)
+            print(f"cProfile stats written to {cprofile_file}", file=sys.stderr)
+        if output in ('1', 'table'):
+            print("\n" + PROFILER.table(), file=sys.stderr)
+        elif output:
+            try:
+                PROFILER.write_jsonl(output, command, args)
+            except OSError as e:
+                print(f"Could not write timings to {output}: {e}", file=sys.stderr)
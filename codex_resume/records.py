@@ -0,0 +1,219 @@
+"""
+Codex Resume Records - Streaming reader for rollout files
+Yields one typed record at a time so memory stays flat for any session size
+
+Rollouts are mmapped: line boundaries and record types are found in the
+mapping itself, and only lines that get decoded are copied out of it.
+"""
+import json
+import mmap
+import os
+import re
+from collections import namedtuple
+
+from codex_resume.decode import decode_line, decode_span
+from codex_resume.profile import count
+
+# type is 'type' or the legacy 'record_type'; data is the decoded line
+Record = namedtuple('Record', ['type', 'role', 'data'])
+
+REVERSE_BLOCK = 64 * 1024
+# Mapped pages are handed back every this many bytes scanned, so a pass over
+# a large rollout doesn't keep all of it in the process's resident set
+RELEASE_BYTES = 8 * 1024 * 1024
+
+# The conversation-only modes need nothing but these
+MESSAGE_TYPES = frozenset(['message'])
+
+FUNCTION_CALL_MARKERS = (b'"type":"function_call"', b'"type": "function_call"')
+FUNCTION_CALL_PATTERN = re.compile(b'|'.join(re.escape(marker) for marker in FUNCTION_CALL_MARKERS))
+TOOL_NAME_PATTERN = re.compile(rb'"name":\s*"((?:[^"\\]|\\.)*)"')
+
+def make_record(data):
+    return Record(data.get('type') or data.get('record_type'), data.get('role', ''), data)
+
+def map_file(f):
+    """Read-only mmap of an open file, or None if it is empty or can't be mapped"""
+    try:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (ValueError, OSError):
+        return None
+
+def release(buffer, start, end):
+    """Drop buffer[start:end] from the resident set; the page cache keeps it"""
+    if not hasattr(mmap, 'MADV_DONTNEED') or not isinstance(buffer, mmap.mmap):
+        return
+    start -= start % mmap.PAGESIZE
+    if end > start:
+        try:
+            buffer.madvise(mmap.MADV_DONTNEED, start, end - start)
+        except (OSError, ValueError):
+            pass
+
+def iter_spans(buffer, start=0):
+    """(start, end) of each line from offset start; end is past the newline if there is one"""
+    size = len(buffer)
+    released = start
+    while start < size:
+        end = buffer.find(b'\n', start) + 1 or size
+        yield start, end
+        start = end
+        if start - released >= RELEASE_BYTES:
+            release(buffer, released, start)
+            released = start
+
+def iter_spans_reverse(buffer):
+    """(start, end) of each line from the last one to the first, newlines excluded"""
+    end = len(buffer)
+    released = end
+    while True:
+        newline = buffer.rfind(b'\n', 0, end)
+        yield newline + 1, end
+        if newline < 0:
+            return
+        end = newline
+        if released - end >= RELEASE_BYTES:
+            release(buffer, end + mmap.PAGESIZE, released)
+            released = end
+
+class RecordStream:
+    """Forward record stream that remembers how far into the rollout it got
+
+    Reading can start at a byte offset left by an earlier pass, so a rollout
+    that is still being appended to only needs its new lines parsed.
+    """
+    
+    def __init__(self, session_file, types=None, start=0):
+        self.session_file = session_file
+        self.types = types
+        self.offset = start
+        self.complete = True
+    
+    @property
+    def checkpoint(self):
+        """Offset to resume from next time, or None if the file ended mid-line"""
+        return self.offset if self.complete else None
+    
+    def __iter__(self):
+        first = self.offset
+        lines = kept = 0
+        try:
+            with open(self.session_file, 'rb') as f:
+                buffer = map_file(f)
+                if buffer is None:
+                    for record in self.iter_file(f):
+                        kept += 1
+                        yield record
+                    return
+                with buffer:
+                    for start, end in iter_spans(buffer, self.offset):
+                        lines += 1
+                        if buffer[end - 1] != 0x0a:
+                            self.complete = False
+                        else:
+                            self.offset = end
+                        data = decode_span(buffer, start, end, self.types)
+                        if data is not None:
+                            kept += 1
+                            yield make_record(data)
+        finally:
+            count(bytes=self.offset - first, lines=lines, kept=kept, dropped=lines - kept)
+    
+    def iter_file(self, f):
+        """The same stream read line by line, for files that can't be mapped"""
+        f.seek(self.offset)
+        for line in f:
+            if not line.endswith(b'\n'):
+                # Possibly still being written; don't resume past it
+                self.complete = False
+            else:
+                self.offset += len(line)
+            data = decode_line(line, self.types)
+            if data is not None:
+                yield make_record(data)
+
+def iter_records(session_file, types=None, start=0):
+    """Yield the records of a rollout in file order, skipping blank and bad lines
+
+    types limits the stream to those record types; other lines are never decoded.
+    """
+    return iter(RecordStream(session_file, types, start))
+
+def iter_lines_reverse(f, block_size):
+    """Yield the raw lines of a binary file from the last one to the first"""
+    f.seek(0, os.SEEK_END)
+    position = f.tell()
+    partial = b''
+    while position > 0:
+        size = min(block_size, position)
+        position -= size
+        f.seek(position)
+        lines = (f.read(size) + partial).split(b'\n')
+        # The first piece may continue in the previous block
+        partial = lines[0]
+        for line in reversed(lines[1:]):
+            yield line
+    yield partial
+
+def iter_records_reverse(session_file, block_size=REVERSE_BLOCK, types=None):
+    """Yield the records of a rollout newest-first, reading from the end in blocks"""
+    with open(session_file, 'rb') as f:
+        buffer = map_file(f)
+        if buffer is None:
+            for line in iter_lines_reverse(f, block_size):
+                data = decode_line(line, types)
+                if data is not None:
+                    yield make_record(data)
+            return
+        size = first = len(buffer)
+        lines = kept = 0
+        try:
+            with buffer:
+                for start, end in iter_spans_reverse(buffer):
+                    lines += 1
+                    first = start
+                    data = decode_span(buffer, start, end, types)
+                    if data is not None:
+                        kept += 1
+                        yield make_record(data)
+        finally:
+            count(bytes=size - first, lines=lines, kept=kept, dropped=lines - kept)
+
+def tool_name(buffer, start, end):
+    match = TOOL_NAME_PATTERN.search(buffer, start, end)
+    try:
+        return json.loads(b'"' + match.group(1) + b'"') if match else 'other'
+    except ValueError:
+        return 'other'
+
+def count_tool_calls(session_file):
+    """Tool name -> call count, from a raw byte scan with no JSON decoding
+
+    The scan jumps from one function_call marker to the next in the mapped
+    file, so the lines in between (tool outputs included) are never copied.
+    """
+    counts = {}
+    with open(session_file, 'rb') as f:
+        buffer = map_file(f)
+        if buffer is None:
+            for line in f:
+                if FUNCTION_CALL_PATTERN.search(line):
+                    name = tool_name(line, 0, len(line))
+                    counts[name] = counts.get(name, 0) + 1
+            return counts
+        with buffer:
+            position = released = 0
+            while True:
+                match = FUNCTION_CALL_PATTERN.search(buffer, position)
+                if match is None:
+                    break
+                start = buffer.rfind(b'\n', 0, match.start()) + 1
+                end = buffer.find(b'\n', match.end()) + 1 or len(buffer)
+                name = tool_name(buffer, start, end)
+                counts[name] = counts.get(name, 0) + 1
+                position = end
+                if position - released >= RELEASE_BYTES:
+                    release(buffer, released, position)
+                    released = position
+            count(bytes=len(buffer), tool_calls=sum(counts.values()))
+    return counts
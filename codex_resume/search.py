@@ -0,0 +1,260 @@
+"""
+Codex Resume Search - Full-text search over every rollout in ~/.codex/sessions
+User and assistant messages and tool calls go into a SQLite FTS5 index that
+only ever reads rollouts that are new or were appended to since the last run
+"""
+import json
+import os
+import sqlite3
+from pathlib import Path
+
+from codex_resume import client
+from codex_resume.decode import replace_surrogates
+from codex_resume.index import SessionIndex, format_start
+from codex_resume.pipeline import ENTRIES_VERSION, MESSAGE_KINDS, initial_state, iter_entries
+from codex_resume.profile import count, phase
+from codex_resume.records import RecordStream
+
+SEARCH_DB = Path(os.environ.get('CODEX_RESUME_SEARCH_DB', Path.home() / ".codex" / "resume-search.db"))
+# Bump whenever the schema or what gets indexed changes; the index is rebuilt
+SEARCH_VERSION = 3
+
+# Record types and entry kinds that are searchable; tool outputs are not
+SEARCH_TYPES = frozenset(['message', 'function_call'])
+SEARCH_KINDS = frozenset(['user', 'assistant', 'tool_call'])
+# Matching turns shown under each session
+TURNS_PER_SESSION = 3
+# Words of context around the match in each snippet
+SNIPPET_WORDS = 12
+# A sync commits after this many new turns; FTS5 writes far fewer segments
+# for a few large transactions than for one per rollout
+COMMIT_TURNS = 50000
+
+DROP_SCHEMA = """
+DROP TABLE IF EXISTS turns_fts;
+DROP TABLE IF EXISTS turns;
+DROP TABLE IF EXISTS rollouts;
+"""
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS rollouts (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    cwd TEXT,
+    start TEXT,
+    size INTEGER,
+    ino INTEGER,
+    sig TEXT,
+    checkpoint INTEGER,
+    state TEXT,
+    turns INTEGER
+);
+CREATE TABLE IF NOT EXISTS turns (
+    id INTEGER PRIMARY KEY,
+    rollout INTEGER NOT NULL,
+    turn INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS turns_rollout ON turns (rollout);
+CREATE VIRTUAL TABLE IF NOT EXISTS turns_fts USING fts5(
+    text, content='turns', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS turns_insert AFTER INSERT ON turns BEGIN
+    INSERT INTO turns_fts (rowid, text) VALUES (new.id, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS turns_delete AFTER DELETE ON turns BEGIN
+    INSERT INTO turns_fts (turns_fts, rowid, text) VALUES ('delete', old.id, old.text);
+END;
+"""
+
+# Rollouts ranked by the summed bm25 rank of their matching turns (lower is better)
+RANK_QUERY = """
+SELECT rollouts.id, rollouts.path, rollouts.cwd, rollouts.start, rollouts.turns,
+       SUM(turns_fts.rank) AS score, COUNT(*)
+FROM turns_fts
+JOIN turns ON turns.id = turns_fts.rowid
+JOIN rollouts ON rollouts.id = turns.rollout
+WHERE turns_fts MATCH ?
+GROUP BY turns.rollout
+ORDER BY score, rollouts.start DESC
+LIMIT ? OFFSET ?
+"""
+
+TURNS_QUERY = """
+SELECT turns.rollout, turns.turn, turns.kind, snippet(turns_fts, 0, '«', '»', '...', {words})
+FROM turns_fts JOIN turns ON turns.id = turns_fts.rowid
+WHERE turns_fts MATCH ? AND turns.rollout IN ({rollouts})
+ORDER BY turns.rollout, turns_fts.rank
+"""
+
+def match_expression(query):
+    """FTS5 MATCH string for a plain query: every word must appear"""
+    return " ".join('"' + word.replace('"', '""') + '"' for word in query.split())
+
+def initial_search_state():
+    """initial_state() plus the conversation turns counted so far"""
+    return dict(initial_state(), turns=0, last_message=-1)
+
+def iter_turns(stream, state):
+    """(turn, kind, text) for the searchable entries of a record stream
+    
+    Turns are numbered like the conversation codex-resume loads and --list
+    counts: meta messages are skipped, the first real message is turn 1,
+    and tool calls take the number of the message before them.
+    """
+    for kind, text, message in iter_entries(stream, state):
+        if kind in MESSAGE_KINDS and message != state['last_message']:
+            state['turns'] += 1
+            state['last_message'] = message
+        if kind in SEARCH_KINDS:
+            yield state['turns'], kind, text
+
+class SearchIndex:
+    """The FTS5 database and the rollout offsets it has indexed up to"""
+    
+    def __init__(self, path=SEARCH_DB):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(str(self.path), timeout=10)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.setup()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def close(self):
+        self.db.close()
+    
+    def setup(self):
+        version = f"{SEARCH_VERSION}-{ENTRIES_VERSION}"
+        with self.db:
+            self.db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            row = self.db.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+            if row is None or row[0] != version:
+                # Different schema or filter rules: index everything again
+                self.db.executescript(DROP_SCHEMA)
+            self.db.executescript(SCHEMA)
+            self.db.execute("INSERT OR REPLACE INTO meta VALUES ('version', ?)", (version,))
+    
+    def sync(self, entries):
+        """Bring the index up to date with SessionIndex entries (path -> entry)
+        
+        Appended rollouts are read from where the last sync stopped; replaced
+        or truncated ones are read again from the start.
+        """
+        known = {path: (rollout, size, ino, sig, checkpoint, state)
+                 for rollout, path, size, ino, sig, checkpoint, state in self.db.execute(
+                     "SELECT id, path, size, ino, sig, checkpoint, state FROM rollouts")}
+        with self.db:
+            for path in known.keys() - entries.keys():
+                self.forget(known[path][0])
+            
+            indexed = pending = 0
+            for path, entry in entries.items():
+                previous = known.get(path)
+                if previous is not None and previous[3] == json.dumps(entry['sig']):
+                    continue
+                try:
+                    pending += self.add(path, entry, previous)
+                except OSError:
+                    continue
+                indexed += 1
+                if pending >= COMMIT_TURNS:
+                    # Keep what is done if a first build over years of history is interrupted
+                    self.db.commit()
+                    pending = 0
+        count(indexed=indexed)
+    
+    def forget(self, rollout):
+        """Drop a rollout and its turns"""
+        self.db.execute("DELETE FROM turns WHERE rollout = ?", (rollout,))
+        self.db.execute("DELETE FROM rollouts WHERE id = ?", (rollout,))
+    
+    def add(self, path, entry, previous):
+        """Index the new part of one rollout, or all of it; returns the turns added"""
+        size, _, ino = entry['sig']
+        start, state = 0, initial_search_state()
+        if previous is not None:
+            _, old_size, old_ino, _, checkpoint, old_state = previous
+            if ino == old_ino and size >= old_size and checkpoint is not None:
+                start, state = checkpoint, json.loads(old_state)
+        
+        stream = RecordStream(path, SEARCH_TYPES, start)
+        rows = list(iter_turns(stream, state))
+        
+        if previous is not None and not start:
+            self.forget(previous[0])
+            previous = None
+        if previous is None:
+            rollout = self.db.execute(
+                "INSERT INTO rollouts (path, cwd, start, size, ino, sig, checkpoint, state, turns)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (path, entry['cwd'], entry.get('start'), size, ino, json.dumps(entry['sig']),
+                 stream.checkpoint, json.dumps(state), state['turns'])).lastrowid
+        else:
+            rollout = previous[0]
+            self.db.execute(
+                "UPDATE rollouts SET size = ?, sig = ?, checkpoint = ?, state = ?, turns = ? WHERE id = ?",
+                (size, json.dumps(entry['sig']), stream.checkpoint, json.dumps(state), state['turns'], rollout))
+        self.db.executemany("INSERT INTO turns (rollout, turn, kind, text) VALUES (?, ?, ?, ?)",
+                            [(rollout, turn, kind, replace_surrogates(text)) for turn, kind, text in rows])
+        count(turns=len(rows))
+        return len(rows)
+    
+    def query(self, query, limit, offset=0):
+        """(results, more): ranked sessions matching every word of query
+        
+        Each result carries its best matching turns with a highlighted
+        snippet, and turns: how many the whole conversation has.
+        """
+        expression = match_expression(query)
+        if not expression:
+            return [], False
+        ranked = self.db.execute(RANK_QUERY, (expression, limit + 1, offset)).fetchall()
+        more = len(ranked) > limit
+        ranked = ranked[:limit]
+        if not ranked:
+            return [], False
+        
+        turns = {}
+        sql = TURNS_QUERY.format(words=SNIPPET_WORDS, rollouts=",".join("?" * len(ranked)))
+        for rollout, turn, kind, snippet in self.db.execute(sql, (expression, *[row[0] for row in ranked])):
+            matches = turns.setdefault(rollout, [])
+            if len(matches) < TURNS_PER_SESSION:
+                matches.append({'turn': turn, 'kind': kind, 'snippet': " ".join(snippet.split())})
+        
+        results = []
+        for rollout, path, cwd, start, total, score, hits in ranked:
+            results.append({
+                'path': path,
+                'name': Path(path).name,
+                'cwd': cwd,
+                'started': format_start(start),
+                'score': round(-score, 3),
+                'hits': hits,
+                'turns': total,
+                'matches': turns.get(rollout, []),
+            })
+        return results, more
+
+def search_sessions(query, limit, offset=0):
+    """(results, more) for one page of --search; see SearchIndex.query"""
+    reply = client.request('search', query=query, limit=limit, offset=offset)
+    if reply is not None:
+        return reply['sessions'], reply['more']
+    with phase('index load'):
+        index = SessionIndex.load()
+    with phase('index scan'):
+        index.refresh()
+    with phase('index save'):
+        index.save()
+    with SearchIndex() as search:
+        with phase('search sync'):
+            search.sync(index.entries)
+        with phase('search query'):
+            return search.query(query, limit, offset)
@@ -0,0 +1,21 @@
+"""
+Codex Resume Settings - Numeric settings read from the environment
+A malformed value is reported and replaced by the default instead of crashing
+"""
+import os
+import sys
+
+def env_int(name, default, minimum=0):
+    """Integer value of environment variable name, or default if unset or invalid"""
+    value = os.environ.get(name, '')
+    if not value.strip():
+        return default
+    try:
+        number = int(value)
+    except ValueError:
+        number = None
+    if number is not None and number >= minimum:
+        return number
+    print(f"Ignoring {name}={value!r} (expected a whole number of at least {minimum}); using the default",
+          file=sys.stderr)
+    return default
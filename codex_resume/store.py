@@ -0,0 +1,92 @@
+"""
+Codex Resume Store - Compact struct-of-arrays storage for pipeline entries
+One byte of kind, one message number and one offset per entry; all text
+lives in a single UTF-8 buffer and is decoded only when it is read
+"""
+from array import array
+
+# Entry kinds in code order; codes are stored as single bytes
+KINDS = ('user', 'assistant', 'instruction', 'tool_call', 'tool_output', 'reasoning')
+KIND_CODES = {kind: code for code, kind in enumerate(KINDS)}
+
+class EntryStore:
+    """Append-only list of (kind, text, message) entries
+
+    message is the number of the conversation message an entry came from,
+    or -1 for entries that are not part of a message.  Iterating yields
+    (kind, text, message) tuples; select() skips unwanted kinds without
+    decoding their text.
+    """
+
+    __slots__ = ('kinds', 'messages', 'offsets', 'buffer')
+
+    def __init__(self):
+        self.kinds = bytearray()
+        self.messages = array('q')
+        self.offsets = array('Q', [0])
+        self.buffer = bytearray()
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def append(self, kind, text, message=-1):
+        self.kinds.append(KIND_CODES[kind])
+        self.messages.append(message)
+        self.buffer += text.encode('utf-8', 'surrogatepass')
+        self.offsets.append(len(self.buffer))
+
+    def kind(self, index):
+        return KINDS[self.kinds[index]]
+
+    def text(self, index):
+        start, end = self.offsets[index], self.offsets[index + 1]
+        return self.buffer[start:end].decode('utf-8', 'surrogatepass')
+
+    def message(self, index):
+        return self.messages[index]
+
+    def entry(self, index):
+        return self.kind(index), self.text(index), self.messages[index]
+
+    def select(self, kinds=None, reverse=False):
+        """(kind, text, message) for entries of the given kinds, in order or newest first"""
+        codes = None if kinds is None else {KIND_CODES[kind] for kind in kinds}
+        indices = range(len(self) - 1, -1, -1) if reverse else range(len(self))
+        for index in indices:
+            if codes is None or self.kinds[index] in codes:
+                yield self.entry(index)
+
+    def __iter__(self):
+        return self.select()
+
+    def __reversed__(self):
+        return self.select(reverse=True)
+
+    def extend(self, other):
+        """Append every entry of other, e.g. the entries parsed from an append"""
+        base = self.offsets[-1]
+        self.kinds += other.kinds
+        self.messages.extend(other.messages)
+        self.offsets.extend(offset + base for offset in other.offsets[1:])
+        self.buffer += other.buffer
+        return self
+
+    def dump(self):
+        """Plain bytes for marshal; load() rebuilds the store"""
+        return (bytes(self.kinds), self.messages.tobytes(), self.offsets.tobytes(), bytes(self.buffer))
+
+    @classmethod
+    def load(cls, data):
+        store = cls()
+        kinds, messages, offsets, buffer = data
+        store.kinds = bytearray(kinds)
+        store.messages = array('q')
+        store.messages.frombytes(messages)
+        store.offsets = array('Q')
+        store.offsets.frombytes(offsets)
+        store.buffer = bytearray(buffer)
+        return store
+
+def merge_dumps(old, new):
+    """Dump of old's entries followed by new's, for cached_extract"""
+    return EntryStore.load(old).extend(EntryStore.load(new)).dump()
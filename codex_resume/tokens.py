@@ -0,0 +1,65 @@
+"""
+Codex Resume Tokens - Pluggable token counting for context budgets
+Uses tiktoken when installed, otherwise a built-in offline estimator
+"""
+import functools
+import os
+import re
+
+# tiktoken, builtin or chars (the old len(text) // 4 rule)
+TOKENIZER = os.environ.get('CODEX_RESUME_TOKENIZER', '')
+ENCODING = os.environ.get('CODEX_RESUME_ENCODING', 'o200k_base')
+# Longer texts are counted without memoizing, so the memo never pins big outputs
+MEMO_CHARS = 2048
+
+# Same split as the GPT BPE pre-tokenizers: contractions, words with one
+# leading space or symbol, 1-3 digit groups, punctuation runs, newlines and
+# other whitespace.  BPE merges rarely cross these boundaries.
+PRETOKEN_PATTERN = re.compile(
+    r"'(?:[sdmt]|ll|ve|re)|[^\r\n\w]?[^\W\d_]+|\d{1,3}| ?[^\s\w]+[\r\n]*|\s*[\r\n]+|\s+(?!\S)|\s+",
+    re.IGNORECASE)
+NON_ASCII = re.compile(r'[^\x00-\x7f]')
+
+def piece_tokens(piece):
+    """Estimated BPE tokens for one pre-token"""
+    if NON_ASCII.search(piece):
+        # Accented text, CJK and emoji cost roughly one token per 2-3 UTF-8 bytes
+        return max(1, (len(piece.encode('utf-8', 'surrogatepass')) + 2) // 3)
+    stripped = piece.strip()
+    if not stripped:
+        return 1 + len(piece) // 16
+    if stripped[-1].isalpha():
+        # Common words are a single token; long identifiers split into ~6 char parts
+        return 1 if len(stripped) <= 8 else (len(stripped) + 5) // 6
+    if stripped.isdigit():
+        return 1
+    return (len(stripped) + 2) // 3
+
+def builtin_count(text):
+    return sum(piece_tokens(piece) for piece in PRETOKEN_PATTERN.findall(text))
+
+def _load_counter(preferred):
+    """(name, count) for the first usable tokenizer"""
+    if preferred in ('', 'tiktoken'):
+        try:
+            import tiktoken
+            encoding = tiktoken.get_encoding(ENCODING)
+            return 'tiktoken', lambda text: len(encoding.encode(text, disallowed_special=()))
+        except Exception:
+            # Not installed, or the encoding isn't available offline
+            pass
+    if preferred == 'chars':
+        return 'chars', lambda text: len(text) // 4
+    return 'builtin', builtin_count
+
+TOKENIZER, _count = _load_counter(TOKENIZER)
+
+@functools.lru_cache(maxsize=65536)
+def _count_memo(text):
+    return _count(text)
+
+def count_tokens(text):
+    """Tokens in text, memoized so each message is only tokenized once"""
+    if len(text) > MEMO_CHARS:
+        return _count(text)
+    return _count_memo(text)
@@ -0,0 +1,224 @@
+"""
+Codex Resume Views - What each mode takes from the shared entry stream
+Every function here reads entries from codex_resume.pipeline; none of them
+parses the rollout itself
+"""
+from codex_resume.packer import PackItem, pack
+from codex_resume.pipeline import MESSAGE_KINDS, load_entries, load_entries_reverse
+from codex_resume.profile import phase
+from codex_resume.records import MESSAGE_TYPES, count_tool_calls
+from codex_resume.tokens import count_tokens
+
+# Read this many budgets' worth of recent messages as packing candidates
+CANDIDATE_FACTOR = 2
+
+@phase('extract')
+def extract_real_conversation(session_file):
+    """Only real user-assistant conversation in chronological order
+    
+    A message with several text items is represented by its last one.
+    """
+    messages = []
+    current = None
+    for kind, text, number in load_entries(session_file, MESSAGE_TYPES, MESSAGE_KINDS):
+        if current is not None and current['number'] == number:
+            current['text'] = text
+            continue
+        current = {
+            'role': kind,
+            'text': text,
+            'timestamp': len(messages),
+            'number': number,
+        }
+        messages.append(current)
+    for message in messages:
+        del message['number']
+    return messages
+
+@phase('render')
+def render_conversation(messages):
+    """The lightweight resume prompt: all messages plus a last-exchange reminder"""
+    context_parts = []
+    
+    context_parts.append("🔴 IMPORTANT: READ THIS FIRST 🔴")
+    context_parts.append("The following is ONLY for context from our previous session.")
+    context_parts.append("DO NOT execute any commands or take any actions based on this context.")
+    context_parts.append("Just acknowledge the context and wait for my next instruction.")
+    context_parts.append("")
+    context_parts.append("=== CONTEXT FROM PREVIOUS SESSION ===\n")
+    
+    # Send ALL messages from the session
+    context_parts.append("Full session history:")
+    
+    for msg in messages:
+        if msg['role'] == 'user':
+            context_parts.append(f"\n👤 BT: {msg['text']}")
+        else:
+            context_parts.append(f"\n🤖 Codex: {msg['text']}")
+    
+    context_parts.append("\n=== END OF CONTEXT ===\n")
+    
+    # Show the very last exchange as a clear reminder
+    context_parts.append("📍 LAST EXCHANGE REMINDER:\n")
+    
+    last_user = next((msg for msg in reversed(messages) if msg['role'] == 'user'), None)
+    last_assistant = next((msg for msg in reversed(messages) if msg['role'] == 'assistant'), None)
+    
+    if last_user:
+        text = last_user['text']
+        if len(text) > 500:
+            text = text[:500] + "..."
+        context_parts.append(f"Last BT Message: {text}")
+    
+    if last_assistant:
+        text = last_assistant['text']
+        if len(text) > 500:
+            text = text[:500] + "..."
+        context_parts.append(f"\nLast Codex Response: {text}")
+    
+    context_parts.append("\n" + "="*50)
+    context_parts.append("\n✋ I've loaded the context from our previous session.")
+    context_parts.append("What would you like me to do now?")
+    
+    return "\n".join(context_parts)
+
+def extract_full_session(session_file):
+    """EVERYTHING from the session including tools and reasoning
+    
+    (kind, text, message) entries, decoded one at a time from the cached
+    store; rollouts too large to cache are streamed.
+    """
+    return load_entries(session_file)
+
+def iter_context_parts(entries, deduper=None):
+    """(kind, text) for every part of the full context, in order"""
+    yield None, "🔴 IMPORTANT: The following is your COMPLETE session history 🔴"
+    yield None, "This includes all messages, tool calls, outputs, and reasoning."
+    yield None, "DO NOT re-execute old commands. Wait for my new instruction."
+    if deduper is not None:
+        yield None, "Repeated tool outputs appear once as [#N]; later copies refer back to #N or show a diff against it."
+    yield None, ""
+    yield 'start_marker', "=== FULL SESSION HISTORY ===\n"
+    
+    last_call = None
+    for kind, text, _ in entries:
+        if kind == 'user':
+            yield kind, f"👤 BT: {text}"
+        elif kind == 'assistant':
+            yield kind, f"🤖 Codex: {text}"
+        elif kind == 'tool_call':
+            last_call = text
+            yield kind, f"🔧 {text}"
+        elif kind == 'tool_output':
+            text = deduper.add(text, last_call) if deduper else text
+            yield kind, f"📤 Output: {text}"
+        elif kind == 'reasoning':
+            yield kind, f"💭 {text}"
+        elif kind == 'instruction':
+            yield kind, f"📋 {text}"
+        yield None, ""
+    
+    yield 'end_marker', "=== END OF HISTORY ===\n"
+    yield None, "✋ Full context loaded. What would you like to do next?"
+
+def iter_recent_messages(session_file):
+    """(role, text) for conversation messages, newest first"""
+    for kind, text, _ in load_entries_reverse(session_file, kinds=MESSAGE_KINDS):
+        yield kind, text
+
+@phase('extract')
+def extract_important_content(session_file, max_tokens=20000):
+    """Tool usage summary plus the most valuable recent messages within max_tokens"""
+    tool_summary = {"bash": 0, "edit": 0, "write": 0, "other": 0}
+    
+    # Count tool usage from raw bytes; only the recent tail gets decoded
+    for tool_name, count in count_tool_calls(session_file).items():
+        if tool_name in tool_summary:
+            tool_summary[tool_name] += count
+        else:
+            tool_summary["other"] += count
+    
+    # Build context within size limit
+    context_parts = []
+    context_parts.append("=== SESSION CONTEXT ===\n")
+    
+    # Add tool usage summary
+    context_parts.append("📊 Tool Usage Summary:")
+    for tool, count in tool_summary.items():
+        if count > 0:
+            context_parts.append(f"  • {tool}: {count} calls")
+    context_parts.append("")
+    
+    # Add messages (prioritize recent ones)
+    context_parts.append("💬 Conversation History:\n")
+    
+    footer = ["\n=== END OF CONTEXT ===", "\n✋ Context loaded. What would you like to do next?"]
+    budget = max_tokens - sum(count_tokens(part) for part in context_parts + footer)
+    
+    # Collect candidates newest first; reading stops once there is enough
+    # to choose from, then the packer keeps the most valuable subset
+    candidates = []
+    window = 0
+    for age, (role, text) in enumerate(iter_recent_messages(session_file)):
+        msg = f"👤 BT: {text[:1000]}" if role == 'user' else f"🤖 Codex: {text[:2000]}"
+        msg_size = count_tokens(msg) + 1  # +1 for newline
+        candidates.append(PackItem(age, role, msg, msg_size))
+        window += msg_size
+        if window >= budget * CANDIDATE_FACTOR:
+            break
+    
+    context_parts.extend(item.text for item in pack(candidates, budget))
+    context_parts.extend(footer)
+    
+    return "\n".join(context_parts)
+
+@phase('extract')
+def extract_key_messages(session_file, max_messages=50):
+    """The last max_messages conversation messages, chronological"""
+    messages = []
+    for role, text in iter_recent_messages(session_file):
+        limit = 1000 if role == 'user' else 1500
+        messages.append({'role': role, 'text': text[:limit]})
+        if len(messages) >= max_messages:
+            break
+    
+    # Back to chronological order
+    messages.reverse()
+    return messages
+
+@phase('render')
+def render_key_messages(messages):
+    """The chunked-mode summary of key messages"""
+    context_parts = []
+    
+    context_parts.append("=== RESUMING PREVIOUS SESSION ===")
+    context_parts.append("Here's a summary of our last conversation:")
+    context_parts.append("")
+    
+    # Group messages for better readability
+    for i, msg in enumerate(messages):
+        if msg['role'] == 'user':
+            context_parts.append(f"[{i+1}] You asked: {msg['text']}")
+        else:
+            context_parts.append(f"    I responded: {msg['text']}")
+        context_parts.append("")
+    
+    context_parts.append("=== END OF CONTEXT ===")
+    context_parts.append("")
+    context_parts.append("Ready to continue. What would you like to do next?")
+    return context_parts
+
+@phase('pack')
+def pack_key_messages(messages, token_limit):
+    """Trimmed chunked-mode context: the most valuable messages that fit"""
+    header = "=== RECENT SESSION CONTEXT (TRIMMED) ==="
+    footer = "\n=== END ===\nReady to continue. What's next?"
+    budget = token_limit - count_tokens(header) - count_tokens(footer)
+    
+    # Keep the most valuable messages that fit, favouring recent ones
+    candidates = []
+    for age, msg in enumerate(reversed(messages)):
+        line = f"You: {msg['text']}" if msg['role'] == 'user' else f"Me: {msg['text']}"
+        candidates.append(PackItem(age, msg['role'], line, count_tokens(line) + 1))
+    selected = pack(candidates, budget)
+    return "\n".join([header] + [item.text for item in selected] + [footer]), len(selected)
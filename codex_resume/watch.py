@@ -0,0 +1,127 @@
+"""
+Codex Resume Watch - inotify watcher for the sessions tree
+Reports created, appended and deleted rollouts so a long-lived index can be
+kept current without rescanning; Linux only, via libc through ctypes
+"""
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO |
+              IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_ONLYDIR)
+EVENT_HEADER = struct.Struct('iIII')
+# Codex writes a rollout a line at a time; gather a burst into one batch
+DEBOUNCE_SECONDS = 0.2
+# ...but never hold a batch back for longer than this
+BATCH_SECONDS = 1.0
+
+def load_libc():
+    """libc with the inotify calls, or None where inotify is unavailable"""
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or None, use_errno=True)
+        libc.inotify_init1
+    except (OSError, AttributeError):
+        return None
+    libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    return libc
+
+class InotifyWatcher:
+    """Watches every directory under root and yields batches of changed paths
+    
+    A batch may also contain None, meaning the kernel queue overflowed and
+    the caller should fall back to a full refresh.
+    """
+    
+    def __init__(self, root):
+        self.libc = load_libc()
+        if self.libc is None:
+            raise OSError("inotify is not available")
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.root = os.fsencode(root)
+        self.paths = {}
+        self.add_tree(self.root)
+        if not self.paths:
+            os.close(self.fd)
+            raise OSError(f"cannot watch {root}")
+    
+    def add_watch(self, path):
+        wd = self.libc.inotify_add_watch(self.fd, path, WATCH_MASK)
+        if wd >= 0:
+            self.paths[wd] = path
+        return wd
+    
+    def add_tree(self, path):
+        """Watch path and its subdirectories; returns the rollouts found inside"""
+        found = []
+        for directory, subdirs, files in os.walk(path):
+            if self.add_watch(directory) < 0:
+                subdirs[:] = []
+                continue
+            found.extend(os.path.join(directory, name) for name in files)
+        return found
+    
+    def read_events(self):
+        """Changed paths from whatever events are queued right now"""
+        changed = set()
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return changed
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+                name = data[offset + EVENT_HEADER.size:offset + EVENT_HEADER.size + length].rstrip(b'\0')
+                offset += EVENT_HEADER.size + length
+                if mask & IN_Q_OVERFLOW:
+                    changed.add(None)
+                    continue
+                directory = self.paths.get(wd)
+                if mask & IN_IGNORED:
+                    self.paths.pop(wd, None)
+                    continue
+                if directory is None or not name:
+                    continue
+                path = os.path.join(directory, name)
+                if mask & IN_ISDIR:
+                    if mask & (IN_CREATE | IN_MOVED_TO):
+                        # Files may land before the watch does; report them too
+                        changed.update(os.fsdecode(found) for found in self.add_tree(path))
+                    elif mask & IN_MOVED_FROM:
+                        # Everything under the old name is gone
+                        changed.add(None)
+                    continue
+                changed.add(os.fsdecode(path))
+    
+    def wait(self, timeout=None):
+        """Block until something changes, then return one debounced batch"""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+        changed = self.read_events()
+        deadline = time.monotonic() + BATCH_SECONDS
+        while time.monotonic() < deadline and select.select([self.fd], [], [], DEBOUNCE_SECONDS)[0]:
+            changed |= self.read_events()
+        return changed
+    
+    def close(self):
+        os.close(self.fd)
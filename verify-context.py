@@ -1,62 +1,115 @@
 #!/usr/bin/env python3
 """
 Verify Context - Check if full context was loaded
+Reads only the chunk manifest when one matches the context file
 """
 import sys
 from pathlib import Path
 
-def verify_context_file():
+from codex_resume import profile
+from codex_resume.artifact import load_manifest, read_chunk
+from codex_resume.profile import phase
+from codex_resume.tokens import count_tokens
+
+def stats_from_manifest(manifest):
+    counts = manifest.get('counts', {})
+    return {
+        'chars': manifest['chars'],
+        'lines': manifest['lines'],
+        'tokens': manifest['tokens'],
+        'has_start': counts.get('start_marker', 0) > 0,
+        'has_end': counts.get('end_marker', 0) > 0,
+        'user': counts.get('user', 0),
+        'assistant': counts.get('assistant', 0),
+        'tool_calls': counts.get('tool_call', 0),
+        'tool_outputs': counts.get('tool_output', 0),
+    }
+
+def stats_from_content(context_file):
+    """Fallback for context files written without a manifest"""
+    with open(context_file, 'r', encoding='utf-8', errors='surrogatepass') as f:
+        content = f.read()
+
+    return {
+        'chars': len(content),
+        'lines': content.count('\n'),
+        'tokens': count_tokens(content),
+        'has_start': "=== FULL SESSION HISTORY ===" in content,
+        'has_end': "=== END OF HISTORY ===" in content,
+        # Chunked mode writes its summary as "You asked" / "I responded"
+        'user': content.count("👤 BT:") + content.count("] You asked: "),
+        'assistant': content.count("🤖 Codex:") + content.count("    I responded: "),
+        'tool_calls': content.count("[TOOL:"),
+        'tool_outputs': content.count("📤 Output:"),
+    }
+
+def verify_chunks(manifest):
+    """Re-read every chunk and compare it with its checksum"""
+    bad = []
+    for chunk in manifest['chunks']:
+        try:
+            read_chunk(manifest, chunk['index'])
+        except (OSError, ValueError):
+            bad.append(chunk['index'])
+    return bad
+
+def verify_context_file(deep=False):
     context_file = Path.home() / ".codex" / "last-context.txt"
-    
+
     if not context_file.exists():
         print("❌ No context file found at ~/.codex/last-context.txt")
         return False
-    
-    with open(context_file, 'r') as f:
-        content = f.read()
-    
-    lines = content.count('\n')
-    chars = len(content)
-    tokens = chars // 4
-    
+
+    with phase('stats'):
+        manifest = load_manifest()
+        if manifest is not None and Path(manifest['file']) != context_file:
+            manifest = None
+        if manifest is not None and manifest.get('counts'):
+            stats = stats_from_manifest(manifest)
+        else:
+            # Contexts delivered as one block record no kinds; count them in the text
+            stats = stats_from_content(context_file)
+
+    tokens = stats['tokens']
+
     print(f"📊 Context File Stats:")
     print(f"  • File: {context_file}")
-    print(f"  • Size: {chars:,} characters")
-    print(f"  • Lines: {lines:,}")
+    print(f"  • Size: {stats['chars']:,} characters")
+    print(f"  • Lines: {stats['lines']:,}")
     print(f"  • Estimated tokens: {tokens:,}")
-    
-    # Check for key markers
-    has_start = "=== FULL SESSION HISTORY ===" in content
-    has_end = "=== END OF HISTORY ===" in content
-    has_tools = "[TOOL:" in content
-    has_outputs = "📤 Output:" in content
-    
+    if manifest is not None:
+        print(f"  • Chunks: {len(manifest['chunks'])} (from manifest)")
+
     print(f"\n✅ Content Verification:")
-    print(f"  • Has session start: {'✓' if has_start else '✗'}")
-    print(f"  • Has session end: {'✓' if has_end else '✗'}")
-    print(f"  • Has tool calls: {'✓' if has_tools else '✗'}")
-    print(f"  • Has tool outputs: {'✓' if has_outputs else '✗'}")
-    
-    # Count different record types
-    user_count = content.count("👤 BT:")
-    assistant_count = content.count("🤖 Codex:")
-    tool_count = content.count("[TOOL:")
-    output_count = content.count("📤 Output:")
-    
+    print(f"  • Has session start: {'✓' if stats['has_start'] else '✗'}")
+    print(f"  • Has session end: {'✓' if stats['has_end'] else '✗'}")
+    print(f"  • Has tool calls: {'✓' if stats['tool_calls'] else '✗'}")
+    print(f"  • Has tool outputs: {'✓' if stats['tool_outputs'] else '✗'}")
+
     print(f"\n📈 Record Counts:")
-    print(f"  • User messages: {user_count}")
-    print(f"  • Assistant messages: {assistant_count}")
-    print(f"  • Tool calls: {tool_count}")
-    print(f"  • Tool outputs: {output_count}")
-    
+    print(f"  • User messages: {stats['user']}")
+    print(f"  • Assistant messages: {stats['assistant']}")
+    print(f"  • Tool calls: {stats['tool_calls']}")
+    print(f"  • Tool outputs: {stats['tool_outputs']}")
+
+    if deep and manifest is not None:
+        with phase('checksums'):
+            bad = verify_chunks(manifest)
+        if bad:
+            print(f"\n❌ Chunks failing checksum: {', '.join(str(index) for index in bad)}")
+        else:
+            print(f"\n✅ All {len(manifest['chunks'])} chunk checksums match")
+
     if tokens < 50000:
         print(f"\n⚠️  WARNING: Context seems small ({tokens:,} tokens)")
         print("     Expected 50K-250K+ tokens for full context")
         print("     You might be missing content!")
     else:
         print(f"\n✅ Context size looks good ({tokens:,} tokens)")
-    
+
     return True
 
 if __name__ == "__main__":
-    verify_context_file()
\ No newline at end of file
+    args, output, cprofile_file = profile.split_options(sys.argv[1:])
+    with profile.session("codex-verify", args, output, cprofile_file):
+        verify_context_file(deep='--deep' in args)